@@ -0,0 +1,303 @@
+"""
+Batch resume analysis for a directory or zip of PDF/DOCX resumes.
+
+Files are parsed in the resume parser's process pool and analyzed with a
+bounded number of resumes in flight. Identical files (by SHA-256) are analyzed
+once, and analyses already in the resume cache are reused.
+
+Results stream to a JSONL file, one line per input, and/or are inserted as
+Resume rows for a user. Re-running the same command resumes where it stopped:
+inputs already in the JSONL file (or already stored for the user) are skipped,
+and inputs that failed are tried again.
+
+Run this with:
+    python analyze_resumes.py resumes/ --output results.jsonl
+    python analyze_resumes.py resumes.zip --user careers@example.com --concurrency 8
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+import zipfile
+from typing import Callable, Dict, Iterator, Optional, Set, Tuple
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.config import settings
+from app.core.database import SessionLocal, engine, Base, add_missing_columns
+from app.models.models import Resume, User
+from app.services import blob_storage, resume_jobs, resume_parser
+
+RESUME_EXTENSIONS = (".pdf", ".docx")
+
+# Create all tables
+Base.metadata.create_all(bind=engine)
+add_missing_columns(engine)
+
+
+def iter_inputs(source: str) -> Iterator[Tuple[str, int, Callable[[], bytes]]]:
+    """(name, size, loader) for each resume in a directory tree or zip file"""
+    if zipfile.is_zipfile(source):
+        archive = zipfile.ZipFile(source)
+        for info in archive.infolist():
+            if info.is_dir() or info.filename.startswith("__MACOSX/"):
+                continue
+            if info.filename.lower().endswith(RESUME_EXTENSIONS):
+                yield info.filename, info.file_size, lambda info=info: archive.read(info)
+        return
+
+    for root, dirs, files in os.walk(source):
+        dirs.sort()
+        for filename in sorted(files):
+            if filename.lower().endswith(RESUME_EXTENSIONS):
+                path = os.path.join(root, filename)
+
+                def load(path=path) -> bytes:
+                    with open(path, "rb") as f:
+                        return f.read()
+
+                yield os.path.relpath(path, source), os.path.getsize(path), load
+
+
+def load_previous_results(output: Optional[str]) -> Dict[str, str]:
+    """source -> content hash for inputs already written to the JSONL output"""
+    done = {}
+    if output and os.path.exists(output):
+        with open(output) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Partial line from an interrupted run
+                if record.get("error"):
+                    done.pop(record["source"], None)  # e.g. analyzed, but storing the row failed
+                else:
+                    done[record["source"]] = record.get("content_hash")
+    return done
+
+
+class BatchRun:
+    def __init__(self, args, user: Optional[User]):
+        self.args = args
+        self.user = user
+        self.db = SessionLocal()
+        self.output = open(args.output, "a") if args.output else None
+        self.pending_rows = []
+        self.seen: Dict[str, str] = {}  # content hash -> first source with it
+        self.stored_hashes: Set[str] = set()
+        self.counts = {"analyzed": 0, "duplicates": 0, "skipped": 0, "failed": 0}
+        self.processed = 0
+        self.started = time.perf_counter()
+
+        if user:
+            self.stored_hashes = {
+                row.content_hash for row in
+                self.db.query(Resume.content_hash).filter(Resume.user_id == user.id).all()
+            }
+
+    def write(self, record: dict):
+        if self.output:
+            self.output.write(json.dumps(record) + "\n")
+            self.output.flush()
+
+    def progress(self, total: int, source: str, outcome: str):
+        self.processed += 1
+        if self.args.quiet:
+            return
+        elapsed = time.perf_counter() - self.started
+        rate = self.processed / elapsed if elapsed else 0.0
+        print(f"[{self.processed}/{total}] {rate:5.1f}/s  {outcome:<12} {source}")
+
+    def succeeded(self, record: dict):
+        self.counts["analyzed"] += 1
+        self.write(record)
+
+    def storage_failed(self, record: dict, error: Exception):
+        """Record an analyzed input whose row could not be stored, so the next run tries it again"""
+        self.counts["failed"] += 1
+        self.stored_hashes.discard(record["content_hash"])
+        self.write({"source": record["source"], "content_hash": record["content_hash"],
+                    "error": f"Storing failed: {error}"})
+        if not self.args.quiet:
+            print(f"⚠️  Storing failed for {record['source']}: {error}")
+
+    def flush_rows(self):
+        """
+        Store the staged files and bulk insert their Resume rows. All of the
+        run's writes go through here, in one transaction with no awaits inside,
+        so the database is never left locked while analyses are running.
+        Results are written to the JSONL output only once their rows are
+        committed, so an interrupted run never marks an unstored input done.
+        """
+        rows = []
+        for record, staged_path, size in self.pending_rows:
+            analysis = record["analysis"]
+            try:
+                with self.db.begin_nested():
+                    file_path = blob_storage.add_reference(self.db, staged_path, record["content_hash"], size)
+            except Exception as e:
+                if os.path.exists(staged_path):
+                    os.remove(staged_path)
+                self.storage_failed(record, e)
+                continue
+            rows.append((record, Resume(
+                user_id=self.user.id,
+                filename=os.path.basename(record["source"]),
+                file_path=file_path,
+                content_hash=record["content_hash"],
+                analysis_result=analysis,
+                ats_score=analysis.get("ats_score", 75),
+                suggestions=analysis.get("improvements", [])
+            )))
+        self.pending_rows = []
+
+        try:
+            self.db.add_all(row for _, row in rows)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            for record, _ in rows:
+                self.storage_failed(record, e)
+            return
+        for record, _ in rows:
+            self.succeeded(record)
+
+    def add_resume_row(self, record: dict, content: bytes):
+        """Stage the file on disk; it is stored, and record written, with the next flush_rows"""
+        staged_path = blob_storage.staging_path()
+        try:
+            with open(staged_path, "wb") as f:
+                f.write(content)
+        except OSError as e:
+            self.storage_failed(record, e)
+            return
+        self.pending_rows.append((record, staged_path, len(content)))
+        self.stored_hashes.add(record["content_hash"])
+        if len(self.pending_rows) >= self.args.batch_size:
+            self.flush_rows()
+
+    async def analyze_one(self, source: str, content: bytes, content_hash: str, total: int):
+        # A session per input: a shared one would mix the transactions of every task in flight
+        db = SessionLocal()
+        try:
+            analysis = await resume_jobs.analyze_upload(db, os.path.basename(source), content_hash, content)
+            db.commit()  # Resume cache updates
+        except Exception as e:  # Reported per file; the batch carries on
+            self.counts["failed"] += 1
+            self.write({"source": source, "content_hash": content_hash, "error": str(e)})
+            self.progress(total, source, "failed")
+            return
+        finally:
+            db.close()
+
+        record = {
+            "source": source,
+            "content_hash": content_hash,
+            "ats_score": analysis.get("ats_score"),
+            "analysis": analysis
+        }
+        if self.user and content_hash not in self.stored_hashes:
+            self.add_resume_row(record, content)
+        else:
+            self.succeeded(record)
+        self.progress(total, source, f"ats {analysis.get('ats_score')}")
+
+    async def run(self):
+        inputs = list(iter_inputs(self.args.source))
+        total = len(inputs)
+        previous = load_previous_results(self.args.output)
+        for source, content_hash in previous.items():
+            if content_hash:
+                self.seen.setdefault(content_hash, source)
+
+        slots = asyncio.Semaphore(self.args.concurrency)
+        tasks = set()
+        for source, size, load in inputs:
+            if source in previous:
+                self.counts["skipped"] += 1
+                self.progress(total, source, "done before")
+                continue
+            if size > settings.MAX_UPLOAD_SIZE:
+                self.counts["failed"] += 1
+                self.write({"source": source, "error": "File too large"})
+                self.progress(total, source, "too large")
+                continue
+
+            # Wait for a free slot before reading, so only `concurrency` files are in memory
+            await slots.acquire()
+            content = load()
+            content_hash = hashlib.sha256(content).hexdigest()
+
+            if content_hash in self.seen:
+                slots.release()
+                self.counts["duplicates"] += 1
+                self.write({"source": source, "content_hash": content_hash, "duplicate_of": self.seen[content_hash]})
+                self.progress(total, source, "duplicate")
+                continue
+            self.seen[content_hash] = source
+            if self.user and content_hash in self.stored_hashes and not self.output:
+                slots.release()
+                self.counts["skipped"] += 1
+                self.progress(total, source, "stored before")
+                continue
+
+            task = asyncio.create_task(self.analyze_one(source, content, content_hash, total))
+            task.add_done_callback(lambda _: slots.release())
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+        self.flush_rows()
+
+    def close(self):
+        self.db.close()
+        if self.output:
+            self.output.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze a directory or zip of resumes")
+    parser.add_argument("source", help="Directory (searched recursively) or .zip of PDF/DOCX resumes")
+    parser.add_argument("--output", "-o", help="Append results to this JSONL file")
+    parser.add_argument("--user", help="Also store the resumes for the user with this email")
+    parser.add_argument("--concurrency", "-c", type=int, default=4, help="Resumes analyzed at once (default 4)")
+    parser.add_argument("--batch-size", type=int, default=50, help="Resume rows per database insert (default 50)")
+    parser.add_argument("--quiet", "-q", action="store_true", help="Only print the summary")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.source):
+        parser.error(f"{args.source} does not exist")
+    if not args.output and not args.user:
+        parser.error("give --output and/or --user")
+
+    user = None
+    if args.user:
+        db = SessionLocal()
+        user = db.query(User).filter(User.email == args.user).first()
+        db.close()
+        if not user:
+            parser.error(f"no user with email {args.user}")
+
+    print("📄 Starting batch resume analysis...")
+    batch = BatchRun(args, user)
+    try:
+        asyncio.run(batch.run())
+    except KeyboardInterrupt:
+        batch.flush_rows()
+        print("\n⏸️  Interrupted; run the same command again to resume")
+    finally:
+        batch.close()
+        resume_parser.shutdown_pool()
+
+    elapsed = time.perf_counter() - batch.started
+    print(f"\n🎉 Done in {elapsed:.1f}s")
+    for outcome, count in batch.counts.items():
+        print(f"  - {count} {outcome}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.responses import ORJSONRoute
 from app.api.auth import get_current_user
 from app.models.models import User, AptitudeTest
 from app.services.ai_service import ai_service
@@ -9,7 +10,7 @@ from typing import List, Optional
 from datetime import datetime
 import json
 
-router = APIRouter(prefix="/aptitude", tags=["Aptitude Tests"])
+router = APIRouter(prefix="/aptitude", tags=["Aptitude Tests"], route_class=ORJSONRoute)
 
 
 class QuestionRequest(BaseModel):
@@ -97,7 +98,15 @@ async def get_test_history(
     db: Session = Depends(get_db)
 ):
     """Get user's test history"""
-    tests = db.query(AptitudeTest).filter(
+    tests = db.query(
+        AptitudeTest.id,
+        AptitudeTest.category,
+        AptitudeTest.score,
+        AptitudeTest.correct_answers,
+        AptitudeTest.total_questions,
+        AptitudeTest.time_taken,
+        AptitudeTest.created_at
+    ).filter(
         AptitudeTest.user_id == current_user.id
     ).order_by(AptitudeTest.created_at.desc()).all()
     
@@ -110,7 +119,7 @@ async def get_test_history(
                 "correct_answers": test.correct_answers,
                 "total_questions": test.total_questions,
                 "time_taken": test.time_taken,
-                "created_at": test.created_at.isoformat()
+                "created_at": test.created_at
             }
             for test in tests
         ],
@@ -125,7 +134,7 @@ async def get_stats(
     db: Session = Depends(get_db)
 ):
     """Get aptitude test statistics"""
-    tests = db.query(AptitudeTest).filter(
+    tests = db.query(AptitudeTest.category, AptitudeTest.score).filter(
         AptitudeTest.user_id == current_user.id
     ).all()
     
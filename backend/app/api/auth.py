@@ -5,6 +5,7 @@ from datetime import timedelta
 from app.core.database import get_db
 from app.core.security import verify_password, get_password_hash, create_access_token, decode_token
 from app.core.config import settings
+from app.core.responses import ORJSONRoute
 from app.models.models import User
 from app.schemas.schemas import UserCreate, UserLogin, UserResponse, Token
 from fastapi.security import OAuth2PasswordBearer
@@ -18,7 +19,7 @@ class ResetPasswordRequest(BaseModel):
     token: str
     new_password: str
 
-router = APIRouter(prefix="/auth", tags=["Authentication"])
+router = APIRouter(prefix="/auth", tags=["Authentication"], route_class=ORJSONRoute)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
@@ -1,15 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy.orm.attributes import flag_modified
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, undefer
 from app.core.database import get_db
+from app.core.responses import ORJSONRoute
 from app.api.auth import get_current_user
-from app.models.models import User, Course, UserCourse, Lesson
+from app.models.models import User, Course, UserCourse, Lesson, LessonCompletion
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
-from app.services.ai_service import ai_service
+from app.services import catalog_cache, lesson_explanations, lesson_html
 
-router = APIRouter(prefix="/courses", tags=["Courses"])
+router = APIRouter(prefix="/courses", tags=["Courses"], route_class=ORJSONRoute)
 
 
 class EnrollRequest(BaseModel):
@@ -21,204 +23,60 @@ class ProgressUpdate(BaseModel):
     completed: bool
 
 
-# Seed data for courses
-SEED_COURSES = [
-    {
-        "title": "Data Structures & Algorithms",
-        "description": "Master fundamental data structures and algorithms for coding interviews",
-        "category": "Programming",
-        "difficulty": "Intermediate",
-        "total_lessons": 3,
-        "duration_hours": 20,
-        "xp_reward": 200,
-        "lessons": [
-            {
-                "title": "Arrays & Strings",
-                "content": """
-# Arrays and Strings
-
-Arrays are the most fundamental data structure. They store elements in contiguous memory locations.
-
-## Key Concepts
-- **Access**: O(1)
-- **Search**: O(n)
-- **Insertion/Deletion**: O(n)
-
-## Common Techniques
-1. **Two Pointers**: Used for searching pairs, reversing, etc.
-2. **Sliding Window**: Used for subarray problems.
-                """,
-                "duration_minutes": 45,
-                "order": 1,
-                "video_url": "https://www.youtube.com/watch?v=juNzBpC2lXi"
-            },
-            {
-                "title": "Linked Lists",
-                "content": "Linked lists consist of nodes where each node contains data and a reference to the next node.",
-                "duration_minutes": 60,
-                "order": 2,
-                "video_url": "https://www.youtube.com/watch?v=njTh_OwMljA"
-            },
-            {
-                "title": "Hash Maps",
-                "content": "Hash maps provide O(1) average time complexity for lookups.",
-                "duration_minutes": 50,
-                "order": 3,
-                "video_url": "https://www.youtube.com/watch?v=c3RVW3KGIIE"
-            }
-        ]
-    },
-    {
-        "title": "System Design Fundamentals",
-        "description": "Learn to design scalable distributed systems",
-        "category": "System Design",
-        "difficulty": "Advanced",
-        "total_lessons": 2,
-        "duration_hours": 15,
-        "xp_reward": 250,
-        "lessons": [
-            {
-                "title": "Scalability Basics",
-                "content": "Vertical vs Horizontal Scaling.",
-                "duration_minutes": 40,
-                "order": 1,
-                "video_url": "https://www.youtube.com/watch?v=xpDnVSmNFX0"
-            },
-            {
-                "title": "Load Balancing",
-                "content": "Distributing traffic across multiple servers.",
-                "duration_minutes": 55,
-                "order": 2,
-                "video_url": "https://www.youtube.com/watch?v=K0GskUdrWqQ"
-            }
-        ]
-    }, 
-    {
-        "title": "Behavioral Interview Mastery",
-        "description": "Ace behavioral interviews with STAR method",
-        "category": "Soft Skills",
-        "difficulty": "Beginner",
-        "total_lessons": 3,
-        "duration_hours": 10,
-        "xp_reward": 150,
-        "lessons": [
-            {
-                "title": "The STAR Method",
-                "content": "Situation, Task, Action, Result.",
-                "duration_minutes": 30,
-                "order": 1,
-                "video_url": "https://www.youtube.com/watch?v=WrlF66fM8F8"
-            },
-            {
-                "title": "Handling 'What is your weakness?'",
-                "content": "Turning negatives into positives.",
-                "duration_minutes": 25,
-                "order": 2,
-                "video_url": "https://www.youtube.com/watch?v=26O-zFv11X4"
-            },
-            {
-                "title": "Questions to Ask the Interviewer",
-                "content": "Show genuine interest and insight.",
-                "duration_minutes": 20,
-                "order": 3,
-                "video_url": "https://www.youtube.com/watch?v=lJ_9M5g0668"
-            }
-        ]
-    },
-    {
-        "title": "Python for Interviews",
-        "description": "Master Python for technical interviews",
-        "category": "Programming",
-        "difficulty": "Beginner",
-        "total_lessons": 3,
-        "duration_hours": 25,
-        "xp_reward": 180,
-        "lessons": [
-             {
-                "title": "Python Lists & Slicing",
-                "content": "Powerful list manipulation techniques.",
-                "duration_minutes": 45,
-                "order": 1,
-                "video_url": "https://www.youtube.com/watch?v=ohCDNzJeQqM"
-            },
-            {
-                "title": "Dictionaries & Sets",
-                "content": "Fast lookups and unique elements.",
-                "duration_minutes": 50,
-                "order": 2,
-                "video_url": "https://www.youtube.com/watch?v=daefaLgNkw0"
-            },
-            {
-                "title": "Object Oriented Python",
-                "content": "Classes, methods, and inheritance.",
-                "duration_minutes": 60,
-                "order": 3,
-                "video_url": "https://www.youtube.com/watch?v=JeznW_7DlB0"
-            }
-        ]
+def _count_completed_lessons(db: Session, user_id: int, course_id: int) -> int:
+    """Number of completed lessons, answered from the (user_id, course_id) index"""
+    return db.query(func.count(LessonCompletion.id)).filter(
+        LessonCompletion.user_id == user_id,
+        LessonCompletion.course_id == course_id
+    ).scalar()
+
+
+def _migrate_legacy_completions(db: Session, user_course: UserCourse):
+    """Move lesson ids from the old completed_lessons JSON list into lesson_completions"""
+    if not user_course.completed_lessons:
+        return
+    
+    existing = {
+        row.lesson_id
+        for row in db.query(LessonCompletion.lesson_id).filter(
+            LessonCompletion.user_id == user_course.user_id,
+            LessonCompletion.course_id == user_course.course_id
+        )
     }
-]
+    for lesson_id in set(user_course.completed_lessons) - existing:
+        db.add(LessonCompletion(
+            user_id=user_course.user_id,
+            lesson_id=lesson_id,
+            course_id=user_course.course_id
+        ))
+    
+    user_course.completed_lessons = []
+    db.flush()
 
 
 @router.get("/")
-async def get_all_courses(db: Session = Depends(get_db)):
+async def get_all_courses(request: Request, db: Session = Depends(get_db)):
     """Get all available courses"""
     
-    # Check if courses need seeding or re-seeding (if no lessons)
-    existing_courses_count = db.query(Course).count()
-    existing_lessons_count = db.query(Lesson).count()
-    
-    if existing_courses_count == 0 or (existing_courses_count > 0 and existing_lessons_count == 0):
-        # Clear existing if no lessons to be safe (re-seed)
-        if existing_courses_count > 0:
-             db.query(UserCourse).delete() # Delete enrollments
-             db.query(Course).delete()
-             db.commit()
-             
-        for course_dict in SEED_COURSES:
-            course_data = course_dict.copy()
-            
-            # Extract lessons data
-            lessons_data = course_data.pop("lessons", [])
-            
-            # Create course
-            course = Course(**course_data)
-            db.add(course)
-            db.flush() # Flush to get the course ID
-            
-            # Create lessons for the course
-            for lesson_dict in lessons_data:
-                lesson_data = lesson_dict.copy()
-                video_url = lesson_data.pop("video_url", "")
-                lesson = Lesson(
-                    title=lesson_data.get("title"),
-                    content=lesson_data.get("content"),
-                    duration_minutes=lesson_data.get("duration_minutes"),
-                    order=lesson_data.get("order"),
-                    course_id=course.id,
-                    video_url=video_url
-                )
-                db.add(lesson)
-                
-        db.commit()
-    
-    courses = db.query(Course).all()
-    
-    return {
-        "courses": [
-            {
-                "id": course.id,
-                "title": course.title,
-                "description": course.description,
-                "category": course.category,
-                "difficulty": course.difficulty,
-                "total_lessons": course.total_lessons,
-                "duration_hours": course.duration_hours,
-                "xp_reward": course.xp_reward
-            }
-            for course in courses
-        ]
-    }
+    def build():
+        courses = db.query(Course).all()
+        return {
+            "courses": [
+                {
+                    "id": course.id,
+                    "title": course.title,
+                    "description": course.description,
+                    "category": course.category,
+                    "difficulty": course.difficulty,
+                    "total_lessons": course.total_lessons,
+                    "duration_hours": course.duration_hours,
+                    "xp_reward": course.xp_reward
+                }
+                for course in courses
+            ]
+        }
+    
+    return catalog_cache.respond(request, db, "courses", build)
 
 
 @router.get("/my-courses")
@@ -228,59 +86,69 @@ async def get_my_courses(
 ):
     """Get courses user is enrolled in"""
     
-    user_courses = db.query(UserCourse).filter(
+    user_courses = db.query(
+        Course.id,
+        Course.title,
+        Course.description,
+        UserCourse.progress_percentage,
+        UserCourse.completed,
+        UserCourse.started_at
+    ).select_from(UserCourse).join(Course, Course.id == UserCourse.course_id).filter(
         UserCourse.user_id == current_user.id
     ).all()
     
-    result = []
-    for uc in user_courses:
-        course = db.query(Course).filter(Course.id == uc.course_id).first()
-        if course:
-            result.append({
-                "id": course.id,
-                "title": course.title,
-                "description": course.description,
+    return {
+        "courses": [
+            {
+                "id": uc.id,
+                "title": uc.title,
+                "description": uc.description,
                 "progress_percentage": uc.progress_percentage,
                 "completed": uc.completed,
-                "started_at": uc.started_at.isoformat()
-            })
-    
-    return {"courses": result}
+                "started_at": uc.started_at
+            }
+            for uc in user_courses
+        ]
+    }
 
 
 @router.get("/{course_id}")
 async def get_course_details(
     course_id: int,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """Get detailed course information"""
     
-    course = db.query(Course).filter(Course.id == course_id).first()
-    
-    if not course:
-        raise HTTPException(status_code=404, detail="Course not found")
-    
-    lessons = db.query(Lesson).filter(Lesson.course_id == course_id).order_by(Lesson.order).all()
-    
-    return {
-        "id": course.id,
-        "title": course.title,
-        "description": course.description,
-        "category": course.category,
-        "difficulty": course.difficulty,
-        "total_lessons": course.total_lessons,
-        "duration_hours": course.duration_hours,
-        "xp_reward": course.xp_reward,
-        "lessons": [
-            {
-                "id": lesson.id,
-                "title": lesson.title,
-                "order": lesson.order,
-                "duration_minutes": lesson.duration_minutes
-            }
-            for lesson in lessons
-        ]
-    }
+    def build():
+        course = db.query(Course).filter(Course.id == course_id).first()
+        
+        if not course:
+            raise HTTPException(status_code=404, detail="Course not found")
+        
+        lessons = db.query(Lesson).filter(Lesson.course_id == course_id).order_by(Lesson.order).all()
+        
+        return {
+            "id": course.id,
+            "title": course.title,
+            "description": course.description,
+            "category": course.category,
+            "difficulty": course.difficulty,
+            "total_lessons": course.total_lessons,
+            "duration_hours": course.duration_hours,
+            "xp_reward": course.xp_reward,
+            "lessons": [
+                {
+                    "id": lesson.id,
+                    "title": lesson.title,
+                    "order": lesson.order,
+                    "duration_minutes": lesson.duration_minutes
+                }
+                for lesson in lessons
+            ]
+        }
+    
+    return catalog_cache.respond(request, db, f"course:{course_id}", build)
 
 
 @router.post("/{course_id}/enroll")
@@ -309,7 +177,6 @@ async def enroll_in_course(
         user_id=current_user.id,
         course_id=course_id,
         progress_percentage=0.0,
-        completed_lessons=[],
         completed=False
     )
     
@@ -339,6 +206,10 @@ async def unenroll_course(
     if not enrollment:
         raise HTTPException(status_code=404, detail="Enrollment not found")
     
+    db.query(LessonCompletion).filter(
+        LessonCompletion.user_id == current_user.id,
+        LessonCompletion.course_id == course_id
+    ).delete(synchronize_session=False)
     db.delete(enrollment)
     db.commit()
     
@@ -370,29 +241,41 @@ async def update_progress(
     
     course = db.query(Course).filter(Course.id == course_id).first()
     
-    # Update completed lessons
-    # IMPORTANT: Create a COPY of the list, modify it, then re-assign it
-    # SQLAlchemy tracking for JSON/Array fields can be tricky if modifying in-place
-    completed_lessons = list(user_course.completed_lessons) if user_course.completed_lessons else []
+    lesson_exists = db.query(Lesson.id).filter(
+        Lesson.id == update.lesson_id,
+        Lesson.course_id == course_id
+    ).first()
+    
+    if not lesson_exists:
+        raise HTTPException(status_code=404, detail="Lesson not found")
     
+    _migrate_legacy_completions(db, user_course)
+    
+    # Toggling is an idempotent insert/delete on the (user_id, lesson_id) unique index
     if update.completed:
-        if update.lesson_id not in completed_lessons:
-            completed_lessons.append(update.lesson_id)
+        try:
+            with db.begin_nested():
+                db.add(LessonCompletion(
+                    user_id=current_user.id,
+                    lesson_id=update.lesson_id,
+                    course_id=course_id
+                ))
+        except IntegrityError:
+            pass  # Already completed
     else:
-        if update.lesson_id in completed_lessons:
-            completed_lessons.remove(update.lesson_id)
-    
-    # Re-assign to trigger update and use flag_modified for JSON tracking
-    user_course.completed_lessons = completed_lessons
-    flag_modified(user_course, "completed_lessons")
+        db.query(LessonCompletion).filter(
+            LessonCompletion.user_id == current_user.id,
+            LessonCompletion.lesson_id == update.lesson_id
+        ).delete(synchronize_session=False)
     
     # Calculate progress
-    progress = (len(completed_lessons) / course.total_lessons) * 100
+    completed_count = _count_completed_lessons(db, current_user.id, course_id)
+    progress = (completed_count / course.total_lessons) * 100
     user_course.progress_percentage = progress
     
     xp_earned = 0
     # Check if course is completed
-    if len(completed_lessons) >= course.total_lessons and not user_course.completed:
+    if completed_count >= course.total_lessons and not user_course.completed:
         user_course.completed = True
         user_course.completed_at = datetime.utcnow()
         
@@ -427,12 +310,21 @@ async def get_course_progress(
     if not user_course:
         raise HTTPException(status_code=404, detail="Not enrolled in this course")
     
+    if user_course.completed_lessons:
+        _migrate_legacy_completions(db, user_course)
+        db.commit()
+    
+    completed_lessons = db.query(LessonCompletion.lesson_id).filter(
+        LessonCompletion.user_id == current_user.id,
+        LessonCompletion.course_id == course_id
+    ).order_by(LessonCompletion.completed_at).all()
+    
     return {
         "progress_percentage": user_course.progress_percentage,
-        "completed_lessons": user_course.completed_lessons or [],
+        "completed_lessons": [row.lesson_id for row in completed_lessons],
         "completed": user_course.completed,
-        "started_at": user_course.started_at.isoformat(),
-        "completed_at": user_course.completed_at.isoformat() if user_course.completed_at else None
+        "started_at": user_course.started_at,
+        "completed_at": user_course.completed_at
     }
 
 
@@ -440,13 +332,15 @@ async def get_course_progress(
 async def get_lesson_details(
     course_id: int,
     lesson_id: int,
+    request: Request,
+    include_markdown: bool = Query(False, description="Also return the raw markdown as content"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get content for a specific lesson (only if enrolled)"""
     
     # Check enrollment
-    user_course = db.query(UserCourse).filter(
+    user_course = db.query(UserCourse.id).filter(
         UserCourse.user_id == current_user.id,
         UserCourse.course_id == course_id
     ).first()
@@ -454,22 +348,33 @@ async def get_lesson_details(
     if not user_course:
         raise HTTPException(status_code=403, detail="You must be enrolled to view lesson content")
     
-    lesson = db.query(Lesson).filter(
-        Lesson.id == lesson_id,
-        Lesson.course_id == course_id
-    ).first()
-    
-    if not lesson:
-        raise HTTPException(status_code=404, detail="Lesson not found")
+    def build():
+        lesson = db.query(Lesson).options(undefer(Lesson.content_html)).filter(
+            Lesson.id == lesson_id,
+            Lesson.course_id == course_id
+        ).first()
         
-    return {
-        "id": lesson.id,
-        "title": lesson.title,
-        "content": lesson.content,
-        "video_url": lesson.video_url,
-        "duration_minutes": lesson.duration_minutes,
-        "order": lesson.order
-    }
+        if not lesson:
+            raise HTTPException(status_code=404, detail="Lesson not found")
+            
+        details = {
+            "id": lesson.id,
+            "title": lesson.title,
+            "content_html": lesson_html.ensure_rendered(db, lesson),
+            "video_url": lesson.video_url,
+            "duration_minutes": lesson.duration_minutes,
+            "order": lesson.order
+        }
+        if include_markdown:
+            details["content"] = lesson.content
+        return details
+    
+    key = f"lesson:{course_id}:{lesson_id}" + (":markdown" if include_markdown else "")
+    # Only enrolled users get here, so shared caches must not keep a copy
+    return catalog_cache.respond(
+        request, db, key, build,
+        cache_control="private, max-age=0, must-revalidate"
+    )
 
 
 @router.get("/{course_id}/lessons/{lesson_id}/explain")
@@ -489,13 +394,10 @@ async def get_ai_explanation(
     if not lesson:
         raise HTTPException(status_code=404, detail="Lesson not found")
         
-    course = db.query(Course).filter(Course.id == course_id).first()
+    course_title = db.query(Course.title).filter(Course.id == course_id).scalar()
     
-    explanation = ai_service.explain_lesson_concept(
-        course_title=course.title,
-        lesson_title=lesson.title,
-        lesson_content=lesson.content
-    )
+    # Served from storage unless the lesson changed since it was generated
+    explanation = await lesson_explanations.get_or_generate(db, lesson, course_title)
     
     return {"explanation": explanation}
 
@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.responses import ORJSONRoute
 from app.models.models import User, AptitudeTest, MockInterview, UserCourse
 from app.api.auth import get_current_user
 from datetime import datetime, timedelta
 from sqlalchemy import func
 
-router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"], route_class=ORJSONRoute)
 
 
 @router.get("/stats")
@@ -105,7 +106,7 @@ async def get_recent_activity(
             "type": "test",
             "title": f"Completed {test.category} Test",
             "score": test.score,
-            "timestamp": test.created_at.isoformat()
+            "timestamp": test.created_at
         })
     
     # Recent interviews
@@ -118,7 +119,7 @@ async def get_recent_activity(
             "type": "interview",
             "title": f"{interview.role} Interview",
             "score": interview.overall_score,
-            "timestamp": interview.created_at.isoformat()
+            "timestamp": interview.created_at
         })
     
     # Sort by timestamp
@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.responses import ORJSONRoute
 from app.api.auth import get_current_user
 from app.models.models import User, Achievement
 from typing import List
 from datetime import datetime
 
-router = APIRouter(prefix="/gamification", tags=["Gamification"])
+router = APIRouter(prefix="/gamification", tags=["Gamification"], route_class=ORJSONRoute)
 
 
 @router.get("/achievements")
@@ -28,7 +29,7 @@ async def get_achievements(
                 "title": achievement.title,
                 "description": achievement.description,
                 "icon": achievement.icon,
-                "earned_at": achievement.earned_at.isoformat()
+                "earned_at": achievement.earned_at
             }
             for achievement in achievements
         ]
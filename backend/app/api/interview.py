@@ -1,14 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Session, undefer_group
 from app.core.database import get_db
+from app.core.responses import ORJSONRoute
 from app.api.auth import get_current_user
-from app.models.models import User, MockInterview
+from app.models.models import User, MockInterview, InterviewResponse
 from app.services.ai_service import ai_service
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
 
-router = APIRouter(prefix="/interview", tags=["Mock Interviews"])
+router = APIRouter(prefix="/interview", tags=["Mock Interviews"], route_class=ORJSONRoute)
 
 
 class StartInterviewRequest(BaseModel):
@@ -25,6 +27,22 @@ class ResponseSubmission(BaseModel):
     expected_points: List[str]
 
 
+def _evaluation_score(evaluation: dict) -> float:
+    """Numeric score from an AI evaluation, tolerating malformed values"""
+    try:
+        return float(evaluation.get("score", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _feedback_entry(answer: InterviewResponse) -> dict:
+    """Feedback item in the shape the frontend expects"""
+    return {
+        "question_id": answer.question_id,
+        **(answer.evaluation or {})
+    }
+
+
 @router.post("/start")
 async def start_interview(
     request: StartInterviewRequest,
@@ -47,8 +65,7 @@ async def start_interview(
         role=request.role,
         difficulty=request.difficulty,
         questions=questions,
-        responses=[],
-        ai_feedback=[],
+        question_count=len(questions),
         overall_score=0
     )
     
@@ -74,12 +91,12 @@ async def submit_response(
 ):
     """Submit response to an interview question"""
     
-    interview = db.query(MockInterview).filter(
+    interview_exists = db.query(MockInterview.id).filter(
         MockInterview.id == interview_id,
         MockInterview.user_id == current_user.id
     ).first()
     
-    if not interview:
+    if not interview_exists:
         raise HTTPException(status_code=404, detail="Interview not found")
     
     # Evaluate the response using AI
@@ -89,24 +106,15 @@ async def submit_response(
         expected_points=response.expected_points
     )
     
-    # Update interview record
-    responses = interview.responses or []
-    feedback = interview.ai_feedback or []
-    
-    responses.append({
-        "question_id": response.question_id,
-        "question": response.question,
-        "response": response.response,
-        "timestamp": datetime.utcnow().isoformat()
-    })
-    
-    feedback.append({
-        "question_id": response.question_id,
-        **evaluation
-    })
-    
-    interview.responses = responses
-    interview.ai_feedback = feedback
+    # One row per answer instead of rewriting the interview's JSON arrays
+    db.add(InterviewResponse(
+        interview_id=interview_id,
+        question_id=response.question_id,
+        question=response.question,
+        response=response.response,
+        score=_evaluation_score(evaluation),
+        evaluation=evaluation
+    ))
     
     db.commit()
     
@@ -133,11 +141,16 @@ async def complete_interview(
         raise HTTPException(status_code=404, detail="Interview not found")
     
     # Calculate overall score
-    if interview.ai_feedback:
-        scores = [f.get("score", 0) for f in interview.ai_feedback]
-        overall_score = sum(scores) / len(scores)
+    overall_score = db.query(func.avg(InterviewResponse.score)).filter(
+        InterviewResponse.interview_id == interview_id
+    ).scalar()
+    if overall_score is not None:
+        feedback_summary = [_feedback_entry(answer) for answer in interview.answers]
     else:
-        overall_score = 0
+        # Interviews started before responses had their own table
+        feedback_summary = interview.ai_feedback or []
+        scores = [_evaluation_score(entry) for entry in feedback_summary]
+        overall_score = sum(scores) / len(scores) if scores else 0
     
     interview.overall_score = overall_score
     
@@ -153,7 +166,7 @@ async def complete_interview(
         "xp_earned": xp_earned,
         "total_xp": current_user.total_xp,
         "level": current_user.level,
-        "feedback_summary": interview.ai_feedback
+        "feedback_summary": feedback_summary
     }
 
 
@@ -164,7 +177,14 @@ async def get_interview_history(
 ):
     """Get user's interview history"""
     
-    interviews = db.query(MockInterview).filter(
+    interviews = db.query(
+        MockInterview.id,
+        MockInterview.role,
+        MockInterview.difficulty,
+        MockInterview.overall_score,
+        MockInterview.question_count,
+        MockInterview.created_at
+    ).filter(
         MockInterview.user_id == current_user.id
     ).order_by(MockInterview.created_at.desc()).all()
     
@@ -175,8 +195,8 @@ async def get_interview_history(
                 "role": interview.role,
                 "difficulty": interview.difficulty,
                 "overall_score": interview.overall_score,
-                "total_questions": len(interview.questions or []),
-                "created_at": interview.created_at.isoformat()
+                "total_questions": interview.question_count or 0,
+                "created_at": interview.created_at
             }
             for interview in interviews
         ]
@@ -191,7 +211,7 @@ async def get_interview_feedback(
 ):
     """Get detailed feedback for an interview"""
     
-    interview = db.query(MockInterview).filter(
+    interview = db.query(MockInterview).options(undefer_group("payload")).filter(
         MockInterview.id == interview_id,
         MockInterview.user_id == current_user.id
     ).first()
@@ -199,14 +219,31 @@ async def get_interview_feedback(
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
     
+    answers = interview.answers
+    if answers:
+        responses = [
+            {
+                "question_id": answer.question_id,
+                "question": answer.question,
+                "response": answer.response,
+                "timestamp": answer.created_at
+            }
+            for answer in answers
+        ]
+        feedback = [_feedback_entry(answer) for answer in answers]
+    else:
+        # Interviews recorded before responses had their own table
+        responses = interview.responses or []
+        feedback = interview.ai_feedback or []
+    
     return {
         "interview_id": interview.id,
         "role": interview.role,
         "difficulty": interview.difficulty,
         "overall_score": interview.overall_score,
         "questions": interview.questions,
-        "responses": interview.responses,
-        "feedback": interview.ai_feedback
+        "responses": responses,
+        "feedback": feedback
     }
 
 @router.get("/{interview_id}/certificate")
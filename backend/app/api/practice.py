@@ -1,13 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.responses import ORJSONRoute
 from app.api.auth import get_current_user
 from app.models.models import User
 from app.services.ai_service import ai_service
 from pydantic import BaseModel
 from typing import List, Optional
 
-router = APIRouter(prefix="/practice", tags=["Practice & Learning"])
+router = APIRouter(prefix="/practice", tags=["Practice & Learning"], route_class=ORJSONRoute)
 
 class CodingRequest(BaseModel):
     category: str
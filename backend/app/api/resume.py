@@ -1,26 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, undefer_group
+from app.core.database import get_db, SessionLocal
 from app.api.auth import get_current_user
-from app.models.models import User, Resume
-from app.services.ai_service import ai_service
-from app.services.resume_parser import parse_resume
+from app.models.models import User, Resume, ResumeJob
+from app.services import resume_jobs, blob_storage
 from app.core.config import settings
+from app.core.file_responses import serve_file
+from app.core.responses import ORJSONRoute, dumps
 from pydantic import BaseModel
 import os
-from datetime import datetime
-import shutil
+import io
+import asyncio
+import hashlib
+import aiofiles
 
-router = APIRouter(prefix="/resume", tags=["Resume Analysis"])
+router = APIRouter(prefix="/resume", tags=["Resume Analysis"], route_class=ORJSONRoute)
 
+UPLOAD_CHUNK_SIZE = 64 * 1024  # 64KB
+JOB_EVENTS_POLL_INTERVAL = 0.5  # seconds
 
-@router.post("/upload")
+
+@router.post("/upload", status_code=202)
 async def upload_resume(
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Upload and analyze resume"""
+    """Upload a resume and queue it for analysis"""
     
     # Validate file type
     if not file.filename.lower().endswith(('.pdf', '.docx')):
@@ -29,57 +36,124 @@ async def upload_resume(
             detail="Only PDF and DOCX files are supported"
         )
     
-    # Save file
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    filename = f"{current_user.id}_{timestamp}_{file.filename}"
-    file_path = os.path.join(settings.UPLOAD_DIR, filename)
-    
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-    
-    # Parse resume
-    with open(file_path, "rb") as f:
-        file_content = f.read()
-    
-    resume_text = parse_resume(file.filename, file_content)
-    
-    if not resume_text:
-        raise HTTPException(
-            status_code=400,
-            detail="Failed to extract text from resume"
-        )
+    # Stream the upload to a staging file in chunks, hashing as we go and
+    # aborting as soon as it exceeds the size limit
+    partial_path = blob_storage.staging_path()
+    buffer = io.BytesIO()
+    sha256 = hashlib.sha256()
+    try:
+        async with aiofiles.open(partial_path, "wb") as out_file:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                if buffer.tell() + len(chunk) > settings.MAX_UPLOAD_SIZE:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File too large. Maximum size is {settings.MAX_UPLOAD_SIZE // (1024 * 1024)}MB"
+                    )
+                sha256.update(chunk)
+                buffer.write(chunk)
+                await out_file.write(chunk)
+    except HTTPException:
+        os.remove(partial_path)
+        raise
     
-    # Analyze resume with AI
-    analysis = ai_service.analyze_resume(resume_text)
+    # Identical content is stored once; the job holds a reference until its
+    # resume takes it over
+    content_hash = sha256.hexdigest()
+    file_path = blob_storage.add_reference(db, partial_path, content_hash, buffer.tell())
     
-    # Create resume record
-    resume = Resume(
+    job = ResumeJob(
         user_id=current_user.id,
         filename=file.filename,
         file_path=file_path,
-        analysis_result=analysis,
-        ats_score=analysis.get("ats_score", 75),
-        suggestions=analysis.get("improvements", [])
+        content_hash=content_hash,
+        status=resume_jobs.QUEUED
     )
-    
-    db.add(resume)
-    
-    # Award XP
-    xp_earned = 15
-    current_user.total_xp += xp_earned
-    current_user.level = (current_user.total_xp // 1000) + 1
-    
+    db.add(job)
     db.commit()
-    db.refresh(resume)
+    db.refresh(job)
+    
+    # Parsing and AI analysis run in the background; the client polls the job
+    resume_jobs.enqueue(job.id, buffer.getvalue())
     
     return {
-        "resume_id": resume.id,
-        "filename": file.filename,
-        "analysis": analysis,
-        "xp_earned": xp_earned
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"/resume/jobs/{job.id}",
+        "events_url": f"/resume/jobs/{job.id}/events"
     }
 
 
+def _job_status(job: ResumeJob, db: Session) -> dict:
+    result = {
+        "job_id": job.id,
+        "status": job.status,
+        "filename": job.filename,
+        "error": job.error,
+        "resume_id": job.resume_id,
+        "created_at": job.created_at,
+        "finished_at": job.finished_at
+    }
+    if job.status == resume_jobs.COMPLETED:
+        resume = db.query(Resume).options(undefer_group("payload")).filter(Resume.id == job.resume_id).first()
+        result["analysis"] = resume.analysis_result if resume else None
+        result["xp_earned"] = job.xp_earned
+    return result
+
+
+def _get_job(job_id: int, user_id: int, db: Session) -> ResumeJob:
+    job = db.query(ResumeJob).filter(
+        ResumeJob.id == job_id,
+        ResumeJob.user_id == user_id
+    ).first()
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/jobs/{job_id}")
+async def get_job_status(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the status (and, once completed, the analysis) of a resume analysis job"""
+    return _job_status(_get_job(job_id, current_user.id, db), db)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_status(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Server-sent events with the job status until it completes or fails"""
+    user_id = current_user.id
+    _get_job(job_id, user_id, db)
+    
+    async def events():
+        last_status = None
+        while True:
+            # Fresh session per check so we see the worker's commits
+            session = SessionLocal()
+            try:
+                status = _job_status(_get_job(job_id, user_id, session), session)
+            finally:
+                session.close()
+            if status["status"] != last_status:
+                last_status = status["status"]
+                yield f"event: status\ndata: {dumps(status).decode()}\n\n"
+            if last_status in (resume_jobs.COMPLETED, resume_jobs.FAILED):
+                return
+            await asyncio.sleep(JOB_EVENTS_POLL_INTERVAL)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/all")
 async def get_all_resumes(
     current_user: User = Depends(get_current_user),
@@ -87,7 +161,12 @@ async def get_all_resumes(
 ):
     """Get all resumes for current user"""
     
-    resumes = db.query(Resume).filter(
+    resumes = db.query(
+        Resume.id,
+        Resume.filename,
+        Resume.ats_score,
+        Resume.created_at
+    ).filter(
         Resume.user_id == current_user.id
     ).order_by(Resume.created_at.desc()).all()
     
@@ -97,7 +176,7 @@ async def get_all_resumes(
                 "id": resume.id,
                 "filename": resume.filename,
                 "ats_score": resume.ats_score,
-                "created_at": resume.created_at.isoformat()
+                "created_at": resume.created_at
             }
             for resume in resumes
         ]
@@ -112,7 +191,7 @@ async def get_resume_analysis(
 ):
     """Get detailed analysis of a specific resume"""
     
-    resume = db.query(Resume).filter(
+    resume = db.query(Resume).options(undefer_group("payload")).filter(
         Resume.id == resume_id,
         Resume.user_id == current_user.id
     ).first()
@@ -126,10 +205,44 @@ async def get_resume_analysis(
         "ats_score": resume.ats_score,
         "analysis": resume.analysis_result,
         "suggestions": resume.suggestions,
-        "created_at": resume.created_at.isoformat()
+        "file_url": f"/resume/{resume.id}/file",
+        "created_at": resume.created_at
     }
 
 
+@router.api_route("/{resume_id}/file", methods=["GET", "HEAD"])
+async def download_resume(
+    resume_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Download the uploaded file of one of the current user's resumes"""
+    
+    resume = db.query(Resume.filename, Resume.file_path, Resume.content_hash).filter(
+        Resume.id == resume_id,
+        Resume.user_id == current_user.id
+    ).first()
+    
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    if blob_storage.is_blob_key(resume.file_path):
+        backend = blob_storage.get_backend()
+        path = backend.local_path(resume.file_path)
+        if path is None:
+            # Object storage: fetch the bytes (uploads are capped at MAX_UPLOAD_SIZE)
+            content = await asyncio.to_thread(blob_storage.read, resume.file_path)
+            return serve_file(request, resume.filename, resume.content_hash, content=content)
+        accel_key = resume.file_path
+    else:
+        path, accel_key = resume.file_path, None  # Saved before content-addressed storage
+    
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Resume file not found")
+    return serve_file(request, resume.filename, resume.content_hash, path=path, accel_key=accel_key)
+
+
 @router.delete("/{resume_id}")
 async def delete_resume(
     resume_id: int,
@@ -146,9 +259,15 @@ async def delete_resume(
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     
-    # Delete file
-    if os.path.exists(resume.file_path):
-        os.remove(resume.file_path)
+    # The blob is removed with its last reference; files saved before
+    # content-addressed storage are only deleted if no other resume uses them
+    if not blob_storage.release(db, resume.file_path):
+        shared = db.query(Resume.id).filter(
+            Resume.file_path == resume.file_path,
+            Resume.id != resume.id
+        ).first()
+        if not shared and os.path.exists(resume.file_path):
+            os.remove(resume.file_path)
     
     db.delete(resume)
     db.commit()
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+from app.core.responses import ORJSONRoute
+from app.services import search_index
+from typing import List, Literal, Optional
+
+router = APIRouter(prefix="/search", tags=["Search"], route_class=ORJSONRoute)
+
+SearchType = Literal["course", "lesson", "faq"]
+
+
+@router.get("")
+async def search(
+    q: str,
+    types: Optional[List[SearchType]] = Query(None, alias="type", description="Restrict to course, lesson and/or faq"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Search courses, lessons and FAQs together, best matches first"""
+    
+    return {
+        "query": q,
+        "results": search_index.search(db, q, limit, types)
+    }
@@ -0,0 +1,178 @@
+"""
+gzip/brotli response compression.
+
+CompressionMiddleware compresses responses whose content type is in
+settings.COMPRESSION_TYPES and whose body is at least
+settings.COMPRESSION_MINIMUM_SIZE bytes. Responses that already carry a
+Content-Encoding (e.g. precompressed catalog snapshots) are passed through
+untouched. Brotli is used when the optional `brotli` package is installed;
+otherwise only gzip is offered.
+"""
+import gzip
+import zlib
+from typing import Dict, Iterable, Optional
+from starlette.datastructures import Headers, MutableHeaders
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Preferred first when the client accepts several equally
+ENCODINGS = ("br", "gzip") if brotli else ("gzip",)
+
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """Compress body; level defaults to the maximum, for bodies compressed once and served many times"""
+    if encoding == "br":
+        return brotli.compress(body, quality=11 if level is None else level)
+    if encoding == "gzip":
+        # mtime=0 keeps the output (and so ETags) identical across processes
+        return gzip.compress(body, compresslevel=9 if level is None else level, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def precompress(body: bytes) -> Dict[str, bytes]:
+    """Every supported encoding of body that is actually smaller than it"""
+    if len(body) < settings.COMPRESSION_MINIMUM_SIZE:
+        return {}
+    variants = {}
+    for encoding in ENCODINGS:
+        compressed = compress(body, encoding)
+        if len(compressed) < len(body):
+            variants[encoding] = compressed
+    return variants
+
+
+def choose_encoding(accept_encoding: Optional[str], available: Iterable[str] = ENCODINGS) -> Optional[str]:
+    """The best of the available encodings allowed by an Accept-Encoding header, or None for identity"""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def _compressible_type(content_type: str) -> bool:
+    media_type = content_type.split(";")[0].strip().lower()
+    return any(
+        media_type.startswith(allowed) if allowed.endswith("/") else media_type == allowed
+        for allowed in settings.COMPRESSION_TYPES
+    )
+
+
+class _StreamCompressor:
+    """Incremental gzip or brotli compressor for streamed bodies"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, chunk: bytes, final: bool) -> bytes:
+        if self.encoding == "br":
+            data = self._compressor.process(chunk)
+            return data + (self._compressor.finish() if final else self._compressor.flush())
+        data = self._compressor.compress(chunk)
+        return data + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing eligible responses with the best encoding the
+    client accepts. Single-message bodies below the minimum size are sent as-is;
+    streamed bodies are compressed chunk by chunk.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor: Optional[_StreamCompressor] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message.get("headers", []))
+                if (
+                    message["status"] < 200 or message["status"] in (204, 206, 304)
+                    or "content-encoding" in headers
+                    or not _compressible_type(headers.get("content-type", ""))
+                    or int(headers.get("content-length", settings.COMPRESSION_MINIMUM_SIZE))
+                    < settings.COMPRESSION_MINIMUM_SIZE
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Hold the headers until we know the body size
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                if not more_body and len(body) < settings.COMPRESSION_MINIMUM_SIZE:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                headers = MutableHeaders(raw=start_message["headers"])
+                headers["content-encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if headers.get("etag", "").endswith('"'):
+                    # The compressed bytes are a different representation, so they get their own ETag
+                    headers["etag"] = f'{headers["etag"][:-1]}-{encoding}"'
+                compressor = _StreamCompressor(encoding)
+
+                if not more_body:
+                    data = compressor.compress(body, final=True)
+                    headers["content-length"] = str(len(data))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": data})
+                    return
+                del headers["content-length"]
+                await send(start_message)
+
+            data = compressor.compress(body, final=not more_body)
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
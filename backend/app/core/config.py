@@ -3,8 +3,20 @@ from typing import List
 
 
 class Settings(BaseSettings):
+    # Production server (serve.py)
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0  # 0 = number of CPU cores available
+    SERVER_KEEPALIVE: int = 5  # seconds; keep above the load balancer's idle timeout when behind one
+    SERVER_BACKLOG: int = 2048  # pending connections queued by the OS
+    SERVER_GRACEFUL_TIMEOUT: int = 30  # seconds a worker gets to drain after SIGTERM before it is killed
+    
     # Database
     DATABASE_URL: str = "sqlite:///./interview_prep.db"
+    SLOW_QUERY_THRESHOLD_MS: float = 100  # 0 disables the slow-query log
+    SEED_ON_STARTUP: bool = True  # Add missing catalog courses/FAQs at startup (or run seed_data.py)
+    DB_SETUP_ON_STARTUP: bool = True  # Create tables, seed and render lessons at startup; serve.py does it once before forking
+    CATALOG_VERSION_CHECK_INTERVAL: float = 2.0  # seconds a worker trusts its cached catalog version
     
     # Security
     SECRET_KEY: str = "dev-secret-key-change-in-production-09876543210"
@@ -20,6 +32,34 @@ class Settings(BaseSettings):
     # File Upload
     MAX_UPLOAD_SIZE: int = 10485760  # 10MB
     UPLOAD_DIR: str = "./uploads"
+    STORAGE_BACKEND: str = "local"  # "local" (sharded files under UPLOAD_DIR) or "s3"
+    S3_BUCKET: str = "resumes"
+    S3_ENDPOINT_URL: str = ""  # empty = local S3 stand-in under UPLOAD_DIR/s3
+    UPLOADS_ACCEL_REDIRECT: str = ""  # nginx internal location for UPLOAD_DIR/blobs, e.g. /protected-uploads/
+    
+    # Resume parsing (runs in a process pool)
+    PARSER_WORKERS: int = 0  # 0 = min(4, CPU count)
+    PARSER_TIMEOUT: float = 15.0  # seconds per document
+    PARSER_MAX_PAGES: int = 20  # 0 = no page limit
+    PARSER_MAX_CHARS: int = 30000  # ATS analysis only needs the first few pages; 0 = no limit
+    PARSER_MAX_MEMORY_MB: int = 512  # per worker address-space limit (POSIX only)
+    
+    # Background resume analysis
+    RESUME_JOB_WORKERS: int = 2  # concurrent jobs per server process
+    RESUME_JOB_STALE_SECONDS: int = 600  # processing jobs older than this are requeued at startup
+    RESUME_JOB_DRAIN_TIMEOUT: float = 15.0  # seconds to finish jobs on shutdown; serve.py needs SERVER_GRACEFUL_TIMEOUT well above it
+    
+    # Response compression
+    COMPRESSION_MINIMUM_SIZE: int = 500  # bytes; smaller bodies are sent uncompressed
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # used when the brotli package is installed
+    COMPRESSION_TYPES: List[str] = [
+        "application/json", "text/", "application/javascript", "image/svg+xml"
+    ]  # entries ending in "/" match the whole type
+    
+    # Metrics
+    METRICS_DIR: str = ""  # Shared directory for multi-worker aggregation; empty = this process only. Empty it on deploy.
+    METRICS_FLUSH_INTERVAL: float = 5.0  # seconds between worker snapshots
     
     class Config:
         env_file = ".env"
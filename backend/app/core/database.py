@@ -1,4 +1,5 @@
-from sqlalchemy import create_engine
+from sqlalchemy import bindparam, create_engine, inspect, select, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -19,3 +20,54 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def _backfill(conn, table, column, compute):
+    """Set a newly added column on existing rows to compute(row), in Python so it works on any database"""
+    primary_key = list(table.primary_key.columns)[0]
+    rows = conn.execute(select(table)).mappings().all()
+    if rows:
+        conn.execute(
+            table.update().where(primary_key == bindparam("row_id")).values({column.name: bindparam("value")}),
+            [{"row_id": row[primary_key.name], "value": compute(row)} for row in rows]
+        )
+
+
+def add_missing_columns(bind=engine):
+    """
+    Add columns and indexes that exist on the models but not yet in the database.
+
+    create_all() only creates missing tables, so databases created by an older
+    version never pick up new columns or their indexes. A column may declare
+    info={"backfill": <function of the row>} to populate existing rows once added.
+    """
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+
+            existing_columns = {col["name"] for col in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+
+                column_type = column.type.compile(dialect=bind.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'))
+
+                backfill = column.info.get("backfill")
+                if backfill:
+                    _backfill(conn, table, column, backfill)
+
+            existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name in existing_indexes:
+                    continue
+                try:
+                    with conn.begin_nested():
+                        index.create(conn, checkfirst=True)
+                except DBAPIError as e:
+                    # e.g. a unique index over rows that already have duplicates; the app still works without it
+                    print(f"⚠️  Could not create index {index.name}: {e.orig}")
@@ -0,0 +1,184 @@
+"""
+Responses for stored uploads: strong ETags from content hashes, conditional
+GETs (304), single byte ranges (206/416) and zero-copy sends.
+
+Zero-copy happens in one of two ways: behind nginx, set
+UPLOADS_ACCEL_REDIRECT so the app only authorizes the request and nginx
+sends the file itself with sendfile; otherwise, if the ASGI server supports
+the zero-copy send extension, the open file is handed to it directly.
+Anything else falls back to chunked reads.
+"""
+import mimetypes
+import os
+import re
+import unicodedata
+from typing import Optional, Tuple
+from urllib.parse import quote
+import anyio
+from fastapi import Request
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+from app.core.config import settings
+
+CHUNK_SIZE = 64 * 1024
+# Per-user files: browsers may keep them forever, shared caches must not
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+# Characters that can't go inside a quoted filename="..." as-is
+_UNQUOTABLE = re.compile(r'[^\x20-\x7e]|["\\]')
+
+
+def content_disposition(filename: str, disposition: str = "inline") -> str:
+    """
+    Content-Disposition for any upload name. Names that aren't plain ASCII (or
+    contain quotes/backslashes) are sent as RFC 5987 filename*=UTF-8''...,
+    with an ASCII filename="..." fallback for clients that ignore it.
+    """
+    if not _UNQUOTABLE.search(filename):
+        return f'{disposition}; filename="{filename}"'
+    # Keep letters readable without their accents (é -> e); anything else becomes _
+    unaccented = "".join(c for c in unicodedata.normalize("NFKD", filename) if not unicodedata.combining(c))
+    fallback = _UNQUOTABLE.sub("_", unaccented)
+    return f"{disposition}; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [value.strip() for value in header.split(",")]
+    return any(value.removeprefix("W/") == etag for value in candidates)
+
+
+def _parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    (start, end) inclusive for a single satisfiable range, None to send the
+    whole file, or (-1, -1) if the range cannot be satisfied.
+    """
+    if not header:
+        return None
+    match = _RANGE.match(header.strip())
+    if not match or (not match.group(1) and not match.group(2)):
+        return None  # Malformed or multiple ranges: RFC 9110 allows ignoring Range
+    first, last = match.groups()
+    if not first:
+        suffix = int(last)
+        if suffix == 0:
+            return (-1, -1)
+        return (max(0, size - suffix), size - 1)
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return (-1, -1)
+    return (start, end)
+
+
+class FileRangeResponse(Response):
+    """Sends length bytes of a file starting at offset"""
+
+    def __init__(self, path: str, offset: int, length: int, status_code: int, headers: dict, head_only: bool):
+        super().__init__(status_code=status_code, headers=headers)
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.head_only = head_only
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if self.head_only or self.length == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        if "http.response.zerocopysend" in scope.get("extensions", {}):
+            with open(self.path, "rb") as file:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": file,
+                    "offset": self.offset,
+                    "count": self.length,
+                    "more_body": False,
+                })
+            return
+
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.offset)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await file.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break  # File shrank underneath us
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def serve_file(
+    request: Request,
+    filename: str,
+    etag: Optional[str],
+    path: Optional[str] = None,
+    content: Optional[bytes] = None,
+    accel_key: Optional[str] = None,
+) -> Response:
+    """
+    Serve a stored file from a local path or from bytes.
+    With an etag (the content hash) the file is treated as immutable; without
+    one (legacy uploads) a validator is derived from the file's stat.
+    accel_key is the blob key to hand to nginx when UPLOADS_ACCEL_REDIRECT is set.
+    """
+    if content is not None:
+        size = len(content)
+        modified = None
+    else:
+        stat_result = os.stat(path)
+        size = stat_result.st_size
+        modified = stat_result.st_mtime
+
+    headers = {
+        "accept-ranges": "bytes",
+        "content-disposition": content_disposition(filename),
+    }
+    if etag:
+        headers["etag"] = f'"{etag}"'
+        headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+    else:
+        headers["etag"] = f'"{int(modified or 0)}-{size}"'
+        headers["cache-control"] = "private, no-cache"
+
+    if etag_matches(request.headers.get("if-none-match"), headers["etag"]):
+        return Response(status_code=304, headers=headers)
+
+    media_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+    if accel_key and settings.UPLOADS_ACCEL_REDIRECT:
+        # nginx serves the bytes (ranges included) from its internal location
+        headers["x-accel-redirect"] = settings.UPLOADS_ACCEL_REDIRECT.rstrip("/") + "/" + accel_key
+        return Response(status_code=200, headers=headers, media_type=media_type)
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if not if_range or if_range.strip() == headers["etag"]:
+        byte_range = _parse_range(request.headers.get("range"), size)
+
+    if byte_range == (-1, -1):
+        headers["content-range"] = f"bytes */{size}"
+        return Response(status_code=416, headers=headers)
+
+    status_code = 200
+    start, end = 0, size - 1
+    if byte_range is not None:
+        start, end = byte_range
+        status_code = 206
+        headers["content-range"] = f"bytes {start}-{end}/{size}"
+    length = max(0, end - start + 1)
+    headers["content-type"] = media_type
+    headers["content-length"] = str(length)
+    head_only = request.method == "HEAD"
+
+    if content is not None:
+        body = b"" if head_only else content[start:end + 1]
+        return Response(content=body, status_code=status_code, headers=headers)
+    return FileRangeResponse(path, start, length, status_code, headers, head_only)
@@ -0,0 +1,461 @@
+"""
+Lightweight Prometheus-style metrics.
+
+Counters, gauges and histograms live in process memory and are rendered in the
+Prometheus text exposition format on /metrics. When METRICS_DIR is set to a
+directory shared by all workers, every worker periodically writes a snapshot
+there and /metrics merges the snapshots, so whichever worker answers a scrape
+reports totals for the whole server. Counters and histograms of workers that
+have exited are folded into a single archive.json, so totals stay monotonic
+without a snapshot file per worker that ever ran. Empty METRICS_DIR on deploy;
+the archive would otherwise carry the previous release's totals forward.
+"""
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Windows: worker liveness isn't checked there, so nothing is folded
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Metric:
+    """Base class: a named family of samples keyed by label values."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def set_value(self, value: float, **labels):
+        """Overwrite a sample, for values mirrored from another source at collect time."""
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def samples(self) -> List[Tuple[Tuple[str, ...], object]]:
+        with self._lock:
+            return [(key, _copy(value)) for key, value in self._values.items()]
+
+
+class Counter(Metric):
+    type_name = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(Metric):
+    type_name = "gauge"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        self.set_value(value, **labels)
+
+
+class Histogram(Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket (non-cumulative) counts, with a final +Inf slot
+                state = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+                self._values[key] = state
+            state["counts"][index] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+
+def _copy(value):
+    if isinstance(value, dict):
+        return {"counts": list(value["counts"]), "sum": value["sum"], "count": value["count"]}
+    return value
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]):
+        """Register a callback that refreshes mirrored values before each export."""
+        self._collectors.append(collector)
+
+    def collect(self):
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                print(f"Metrics collector error: {e}")
+
+    def snapshot(self) -> dict:
+        self.collect()
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            metric.name: {
+                "type": metric.type_name,
+                "help": metric.documentation,
+                "labelnames": list(metric.labelnames),
+                "buckets": list(getattr(metric, "buckets", ())),
+                "samples": [[list(key), value] for key, value in metric.samples()],
+            }
+            for metric in metrics
+        }
+
+
+registry = Registry()
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return registry.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return registry.register(Gauge(name, documentation, labelnames))
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return registry.register(Histogram(name, documentation, labelnames, buckets))
+
+
+# HTTP
+http_requests_total = counter(
+    "http_requests_total", "HTTP requests by route template and status", ("method", "route", "status"))
+http_request_duration = histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route"))
+http_requests_in_flight = gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled")
+
+# AI service
+ai_calls_total = counter(
+    "ai_calls_total", "AIService calls by method and outcome (llm or fallback)", ("method", "outcome"))
+ai_call_duration = histogram(
+    "ai_call_duration_seconds", "AIService call latency by method", ("method",))
+
+# Caches
+cache_lookups_total = counter(
+    "cache_lookups_total", "Cache lookups by cache name and result (hit or miss)", ("cache", "result"))
+
+
+def record_cache_lookup(cache: str, hit: bool):
+    cache_lookups_total.inc(cache=cache, result="hit" if hit else "miss")
+
+
+# --- AIService instrumentation -------------------------------------------------
+
+_ai_call_state = threading.local()
+
+
+def record_ai_fallback():
+    """Mark the AIService call in progress on this thread as having used its fallback."""
+    _ai_call_state.fallback = True
+
+
+def track_ai_call(method: Callable) -> Callable:
+    """Decorator recording call count, latency and fallback use for an AIService method."""
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        outer = getattr(_ai_call_state, "fallback", None)
+        _ai_call_state.fallback = False
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            ai_call_duration.observe(time.perf_counter() - start, method=name)
+            outcome = "fallback" if _ai_call_state.fallback else "llm"
+            ai_calls_total.inc(method=name, outcome=outcome)
+            _ai_call_state.fallback = outer
+
+    return wrapper
+
+
+# --- Database collectors ---------------------------------------------------------
+
+def register_database_collectors(engine):
+    """Mirror connection pool state and SQL statement totals into the registry."""
+    from app.core.query_stats import process_stats
+
+    pool_size = gauge("db_pool_size", "Configured connection pool size")
+    pool_checked_out = gauge("db_pool_checked_out", "Connections currently checked out")
+    pool_overflow = gauge("db_pool_overflow", "Pool overflow as reported by SQLAlchemy (negative while below pool size)")
+    queries_total = counter("db_queries_total", "SQL statements executed")
+    query_seconds_total = counter("db_query_seconds_total", "Time spent executing SQL statements")
+    slow_queries_total = counter("db_slow_queries_total", "SQL statements over the slow-query threshold")
+
+    def collect():
+        pool = engine.pool
+        for metric, attr in ((pool_size, "size"), (pool_checked_out, "checkedout"), (pool_overflow, "overflow")):
+            if hasattr(pool, attr):
+                metric.set(getattr(pool, attr)())
+        queries_total.set_value(process_stats.count)
+        query_seconds_total.set_value(process_stats.duration)
+        slow_queries_total.set_value(process_stats.slow_count)
+
+    registry.add_collector(collect)
+
+
+# --- Multi-worker aggregation ---------------------------------------------------
+
+_worker_id: Optional[str] = None  # Set by start_exporter, so each forked worker gets its own
+_exporter_stop = threading.Event()
+ARCHIVE_FILE = "archive.json"
+
+
+def _snapshot_path() -> str:
+    return os.path.join(settings.METRICS_DIR, f"worker-{_worker_id}.json")
+
+
+def write_snapshot():
+    """Write this worker's metrics to METRICS_DIR (atomic replace)."""
+    if not settings.METRICS_DIR or _worker_id is None:
+        return
+    path = _snapshot_path()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"pid": os.getpid(), "metrics": registry.snapshot()}, f)
+    os.replace(tmp_path, path)
+
+
+def _exporter_loop():
+    while not _exporter_stop.wait(settings.METRICS_FLUSH_INTERVAL):
+        try:
+            write_snapshot()
+        except OSError as e:
+            print(f"Metrics snapshot error: {e}")
+
+
+def start_exporter():
+    """Start the background thread that publishes this worker's snapshot."""
+    global _worker_id
+    if not settings.METRICS_DIR:
+        return
+    # Runs in the worker itself: an id taken at import would be shared by workers forked from a preloaded app
+    _worker_id = f"{os.getpid()}-{time.time_ns()}"
+    os.makedirs(settings.METRICS_DIR, exist_ok=True)
+    _exporter_stop.clear()
+    try:
+        fold_dead_workers()  # Left by workers that exited since the last scrape
+    except OSError as e:
+        print(f"Metrics archive error: {e}")
+    write_snapshot()
+    threading.Thread(target=_exporter_loop, name="metrics-exporter", daemon=True).start()
+
+
+def stop_exporter():
+    _exporter_stop.set()
+    if settings.METRICS_DIR:
+        try:
+            write_snapshot()
+        except OSError as e:
+            print(f"Metrics snapshot error: {e}")
+
+
+def _pid_alive(pid: int) -> bool:
+    if sys.platform == "win32":
+        return True  # os.kill(pid, 0) sends CTRL_C_EVENT on Windows
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _merge(snapshots: List[dict]) -> dict:
+    """
+    Sum samples across workers. Counters and histograms include workers that
+    have exited (and the archive, which has no pid) so totals stay monotonic;
+    gauges only count live workers.
+    """
+    merged: Dict[str, dict] = {}
+    for snapshot in snapshots:
+        pid = snapshot.get("pid")
+        alive = pid is not None and _pid_alive(pid)
+        for name, family in snapshot["metrics"].items():
+            if family["type"] == "gauge" and not alive:
+                continue
+            target = merged.setdefault(name, {**family, "samples": {}})
+            for labels, value in family["samples"]:
+                key = tuple(labels)
+                current = target["samples"].get(key)
+                if current is None:
+                    target["samples"][key] = _copy(value)
+                elif isinstance(value, dict):
+                    current["counts"] = [a + b for a, b in zip(current["counts"], value["counts"])]
+                    current["sum"] += value["sum"]
+                    current["count"] += value["count"]
+                else:
+                    target["samples"][key] = current + value
+    for family in merged.values():
+        family["samples"] = list(family["samples"].items())
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def render(families: dict) -> str:
+    lines = []
+    for name in sorted(families):
+        family = families[name]
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        labelnames = family["labelnames"]
+        for labels, value in sorted(family["samples"], key=lambda s: s[0]):
+            if family["type"] == "histogram":
+                cumulative = 0
+                bounds = list(family["buckets"]) + [float("inf")]
+                for bound, count in zip(bounds, value["counts"]):
+                    cumulative += count
+                    le = _labels(labelnames, labels, ("le", _format_number(bound)))
+                    lines.append(f"{name}_bucket{le} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labelnames, labels)} {_format_number(value['sum'])}")
+                lines.append(f"{name}_count{_labels(labelnames, labels)} {value['count']}")
+            else:
+                lines.append(f"{name}{_labels(labelnames, labels)} {_format_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def _read_snapshot(path: str) -> Optional[dict]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None  # Missing, or being replaced or removed by its worker
+
+
+def fold_dead_workers():
+    """Merge the counters and histograms of exited workers into archive.json and remove their snapshots."""
+    if not settings.METRICS_DIR or fcntl is None:
+        return
+    archive_path = os.path.join(settings.METRICS_DIR, ARCHIVE_FILE)
+    with open(os.path.join(settings.METRICS_DIR, "archive.lock"), "a") as lock:
+        # Serialize the read-modify-write of the archive across workers
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        dead = []
+        for path in glob.glob(os.path.join(settings.METRICS_DIR, "worker-*.json")):
+            snapshot = _read_snapshot(path)
+            if snapshot is not None and not _pid_alive(snapshot["pid"]):
+                dead.append((path, snapshot))
+        if not dead:
+            return
+
+        archive = _read_snapshot(archive_path)
+        merged = _merge(([archive] if archive else []) + [snapshot for _, snapshot in dead])
+        tmp_path = f"{archive_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"pid": None, "metrics": merged}, f)
+        os.replace(tmp_path, archive_path)
+        for path, _ in dead:
+            os.remove(path)
+
+
+def generate_latest() -> str:
+    """Exposition text for this worker, or for all workers when METRICS_DIR is set."""
+    if not settings.METRICS_DIR:
+        return render(_merge([{"pid": os.getpid(), "metrics": registry.snapshot()}]))
+
+    write_snapshot()
+    try:
+        fold_dead_workers()
+    except OSError as e:
+        print(f"Metrics archive error: {e}")
+    paths = glob.glob(os.path.join(settings.METRICS_DIR, "worker-*.json"))
+    paths.append(os.path.join(settings.METRICS_DIR, ARCHIVE_FILE))
+    snapshots = [snapshot for snapshot in map(_read_snapshot, paths) if snapshot is not None]
+    return render(_merge(snapshots))
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status and in-flight count per route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+        http_requests_in_flight.inc()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            route = scope.get("route")
+            # Label by template (/courses/{course_id}) to keep cardinality bounded
+            route_label = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+            http_request_duration.observe(time.perf_counter() - start, method=method, route=route_label)
+            http_requests_total.inc(method=method, route=route_label, status=str(status_code))
@@ -0,0 +1,102 @@
+"""
+Per-request SQL statistics collected from SQLAlchemy cursor events.
+
+Every statement executed while a request is being handled is counted and timed.
+The totals are returned to the client in a Server-Timing header and statements
+slower than settings.SLOW_QUERY_THRESHOLD_MS are written to the slow-query log.
+"""
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+slow_query_logger = logging.getLogger("app.sql.slow")
+
+
+class QueryStats:
+    """Running totals for one request (or for the whole process)."""
+
+    __slots__ = ("count", "duration", "slow_count")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0  # seconds
+        self.slow_count = 0
+
+    def record(self, duration: float, slow: bool):
+        self.count += 1
+        self.duration += duration
+        if slow:
+            self.slow_count += 1
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+# Process-wide totals since startup
+process_stats = QueryStats()
+
+
+def current_stats() -> Optional[QueryStats]:
+    """Stats for the request being handled, or None outside of a request."""
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info["query_start_time"].pop()
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS / 1000
+    slow = 0 < threshold <= duration
+
+    process_stats.record(duration, slow)
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(duration, slow)
+
+    if slow:
+        slow_query_logger.warning(
+            "Slow query (%.1f ms): %s | params=%r",
+            duration * 1000, " ".join(statement.split()), parameters
+        )
+
+
+def install_query_hooks(engine):
+    """Attach the timing listeners to an engine (idempotent)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware that scopes QueryStats to each HTTP request and reports
+    them as `Server-Timing: db;dur=<ms>;desc="<n> queries"`.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                header = f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"'
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", header.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
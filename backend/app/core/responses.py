@@ -0,0 +1,61 @@
+"""
+orjson-backed JSON responses.
+
+ORJSONResponse is the app's default response class. ORJSONRoute goes one step
+further for routes without a response_model: the endpoint's return value is
+handed straight to orjson instead of first being walked by FastAPI's
+jsonable_encoder. orjson serializes datetimes natively (ISO 8601, the same
+text as .isoformat()), so endpoints return datetime values as-is; anything
+else orjson doesn't know falls back to jsonable_encoder.
+"""
+import asyncio
+import functools
+from typing import Any, Callable
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from starlette.responses import Response
+
+OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=jsonable_encoder, option=OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _direct_response(call: Callable, status_code: int) -> Callable:
+    """Wrap an endpoint so plain return values become an ORJSONResponse"""
+    def to_response(result):
+        if isinstance(result, Response):
+            return result
+        return ORJSONResponse(result, status_code=status_code)
+
+    if asyncio.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def endpoint(*args, **kwargs):
+            return to_response(await call(*args, **kwargs))
+    else:
+        @functools.wraps(call)
+        def endpoint(*args, **kwargs):
+            return to_response(call(*args, **kwargs))
+    return endpoint
+
+
+class ORJSONRoute(APIRoute):
+    """
+    Route class for the routers. Routes with a response_model, or that take a
+    Response parameter to set headers, keep FastAPI's normal serialization.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, endpoint, **kwargs)
+        if self.response_field is None and self.dependant.response_param_name is None:
+            # The request handler reads dependant.call per request, so the wrapper takes effect
+            self.dependant.call = _direct_response(self.dependant.call, self.status_code or 200)
@@ -1,13 +1,19 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from app.core.config import settings
-from app.core.database import engine, Base
-from app.api import auth, aptitude, interview, resume, courses, gamification, dashboard, faq, practice
+from app.core.database import engine, Base, SessionLocal, add_missing_columns
+from app.core.query_stats import QueryStatsMiddleware, install_query_hooks
+from app.core import metrics
+from app.core.compression import CompressionMiddleware
+from app.core.responses import ORJSONResponse
+from app.services import resume_parser, resume_jobs, catalog_seed, faq_search, lesson_html
+from app.api import auth, aptitude, interview, resume, courses, gamification, dashboard, faq, practice, search
 import os
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# Count and time SQL statements per request
+install_query_hooks(engine)
+metrics.register_database_collectors(engine)
 
 # Create upload directory if it doesn't exist
 os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
@@ -15,7 +21,8 @@ os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
 app = FastAPI(
     title="AI Interview Preparation System",
     description="Comprehensive interview preparation platform with AI-powered features",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -25,10 +32,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
-
-# Mount static files
-app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads")
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
+# Outermost, so the other middleware see the uncompressed response
+app.add_middleware(CompressionMiddleware)
 
 # Include routers
 app.include_router(auth.router)
@@ -40,6 +49,73 @@ app.include_router(gamification.router)
 app.include_router(dashboard.router)
 app.include_router(faq.router)
 app.include_router(practice.router)
+app.include_router(search.router)
+
+@app.on_event("startup")
+def init_database():
+    # Create missing tables and columns and the FAQ search index. Runs at startup
+    # rather than import so importing the app (e.g. in each new worker) stays cheap.
+    if not settings.DB_SETUP_ON_STARTUP:
+        return
+    Base.metadata.create_all(bind=engine)
+    add_missing_columns(engine)
+    faq_search.install(engine)
+
+
+@app.on_event("startup")
+def seed_catalog():
+    # Add any missing catalog courses, lessons and FAQs; never deletes
+    if not (settings.DB_SETUP_ON_STARTUP and settings.SEED_ON_STARTUP):
+        return
+    db = SessionLocal()
+    try:
+        added = catalog_seed.seed_catalog(db)
+        if any(added.values()):
+            print(f"Seeded catalog: {added}")
+    finally:
+        db.close()
+
+
+@app.on_event("startup")
+def render_lessons():
+    # Render lesson markdown that has no stored HTML yet or whose content changed
+    if not settings.DB_SETUP_ON_STARTUP:
+        return
+    db = SessionLocal()
+    try:
+        rendered = lesson_html.render_all(db)
+        if rendered:
+            print(f"Rendered {rendered} lessons to HTML")
+    finally:
+        db.close()
+
+
+@app.on_event("startup")
+def start_metrics_exporter():
+    metrics.start_exporter()
+
+
+@app.on_event("startup")
+async def start_resume_workers():
+    await resume_jobs.start_workers()
+
+
+@app.on_event("shutdown")
+async def stop_resume_workers():
+    # Drain in-flight analyses before the parser pool goes away
+    await resume_jobs.stop_workers(timeout=settings.RESUME_JOB_DRAIN_TIMEOUT)
+
+
+@app.on_event("shutdown")
+def stop_metrics_exporter():
+    metrics.stop_exporter()
+
+
+@app.on_event("shutdown")
+def stop_parser_pool():
+    # Resume jobs have finished or been requeued by now, so anything still parsing is abandoned
+    resume_parser.shutdown_pool(timeout=1.0)
+
 
 @app.get("/")
 def read_root():
@@ -54,6 +130,11 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    return PlainTextResponse(metrics.generate_latest(), media_type=metrics.CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, Text, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Float, Boolean, Text, ForeignKey, JSON, Index, UniqueConstraint
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 from app.core.database import Base
 
@@ -37,7 +37,7 @@ class AptitudeTest(Base):
     total_questions = Column(Integer)
     correct_answers = Column(Integer)
     time_taken = Column(Integer)  # in seconds
-    questions_data = Column(JSON)  # Store questions and answers
+    questions_data = deferred(Column(JSON), group="payload")  # Store questions and answers
     created_at = Column(DateTime, default=datetime.utcnow)
     
     user = relationship("User", back_populates="aptitude_tests")
@@ -50,13 +50,34 @@ class MockInterview(Base):
     user_id = Column(Integer, ForeignKey("users.id"))
     role = Column(String)  # SDE, Data Scientist, etc.
     difficulty = Column(String)  # Easy, Medium, Hard
-    questions = Column(JSON)
-    responses = Column(JSON)
-    ai_feedback = Column(JSON)
+    # JSON payloads are only loaded on detail views; list queries use question_count
+    questions = deferred(Column(JSON), group="payload")
+    # Legacy per-answer arrays; new answers are stored in interview_responses
+    responses = deferred(Column(JSON), group="payload")
+    ai_feedback = deferred(Column(JSON), group="payload")
+    question_count = Column(Integer, default=0, info={
+        "backfill": lambda row: len(row["questions"]) if isinstance(row["questions"], list) else 0
+    })
     overall_score = Column(Float)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     user = relationship("User", back_populates="mock_interviews")
+    answers = relationship("InterviewResponse", back_populates="interview", order_by="InterviewResponse.id")
+
+
+class InterviewResponse(Base):
+    __tablename__ = "interview_responses"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    interview_id = Column(Integer, ForeignKey("mock_interviews.id"), index=True, nullable=False)
+    question_id = Column(Integer)
+    question = Column(Text)
+    response = Column(Text)
+    score = Column(Float)
+    evaluation = Column(JSON)  # feedback, strengths, improvements from the AI
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    interview = relationship("MockInterview", back_populates="answers")
 
 
 class Resume(Base):
@@ -66,19 +87,64 @@ class Resume(Base):
     user_id = Column(Integer, ForeignKey("users.id"))
     filename = Column(String, nullable=False)
     file_path = Column(String, nullable=False)
-    analysis_result = Column(JSON)
+    content_hash = Column(String, index=True)  # SHA-256 of the uploaded bytes
+    analysis_result = deferred(Column(JSON), group="payload")
     ats_score = Column(Float)
-    suggestions = Column(JSON)
+    suggestions = deferred(Column(JSON), group="payload")
     created_at = Column(DateTime, default=datetime.utcnow)
     
     user = relationship("User", back_populates="resumes")
 
 
+class ResumeJob(Base):
+    """Queued resume analysis; also serves as the durable work queue"""
+    __tablename__ = "resume_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    filename = Column(String, nullable=False)
+    file_path = Column(String, nullable=False)
+    content_hash = Column(String)
+    status = Column(String, default="queued", index=True)  # queued, processing, completed, failed
+    error = Column(String, nullable=True)
+    resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=True)
+    xp_earned = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class ResumeAnalysis(Base):
+    """Parsed text and analysis shared by every upload of the same content"""
+    __tablename__ = "resume_analyses"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String, unique=True, index=True, nullable=False)  # SHA-256 of the file bytes
+    text_hash = Column(String, index=True)  # SHA-256 of the normalized text
+    parsed_text = deferred(Column(Text))
+    analysis = Column(JSON)
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow)
+
+
+class StoredBlob(Base):
+    """An uploaded file in content-addressed storage, with the number of rows using it"""
+    __tablename__ = "stored_blobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String, unique=True, index=True, nullable=False)  # SHA-256 of the file bytes
+    key = Column(String, unique=True, nullable=False)  # Sharded storage key
+    size = Column(Integer)
+    ref_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
 class Course(Base):
     __tablename__ = "courses"
     
     id = Column(Integer, primary_key=True, index=True)
-    title = Column(String, nullable=False)
+    title = Column(String, unique=True, index=True, nullable=False)  # Seeding matches courses by title
     description = Column(Text)
     thumbnail = Column(String)
     category = Column(String)
@@ -100,6 +166,8 @@ class Lesson(Base):
     course_id = Column(Integer, ForeignKey("courses.id"))
     title = Column(String, nullable=False)
     content = Column(Text)
+    content_html = deferred(Column(Text))  # Sanitized HTML rendered from content
+    content_html_hash = Column(String)  # Hash of the content content_html was rendered from
     video_url = Column(String)
     order = Column(Integer)
     duration_minutes = Column(Integer)
@@ -107,6 +175,18 @@ class Lesson(Base):
     course = relationship("Course", back_populates="lessons")
 
 
+class LessonExplanation(Base):
+    """AI explanation of a lesson, valid while the lesson's content hash is unchanged"""
+    __tablename__ = "lesson_explanations"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    lesson_id = Column(Integer, ForeignKey("lessons.id"), unique=True, index=True, nullable=False)
+    content_hash = Column(String, nullable=False)  # SHA-256 of what the explanation was generated from
+    explanation = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
 class UserCourse(Base):
     __tablename__ = "user_courses"
     
@@ -114,7 +194,7 @@ class UserCourse(Base):
     user_id = Column(Integer, ForeignKey("users.id"))
     course_id = Column(Integer, ForeignKey("courses.id"))
     progress_percentage = Column(Float, default=0.0)
-    completed_lessons = Column(JSON, default=[])
+    completed_lessons = Column(JSON, default=[])  # Legacy; completions live in lesson_completions
     completed = Column(Boolean, default=False)
     certificate_url = Column(String, nullable=True)
     started_at = Column(DateTime, default=datetime.utcnow)
@@ -124,6 +204,20 @@ class UserCourse(Base):
     course = relationship("Course", back_populates="user_courses")
 
 
+class LessonCompletion(Base):
+    __tablename__ = "lesson_completions"
+    __table_args__ = (
+        UniqueConstraint("user_id", "lesson_id", name="uq_lesson_completions_user_lesson"),
+        Index("ix_lesson_completions_user_course", "user_id", "course_id"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    lesson_id = Column(Integer, ForeignKey("lessons.id"), nullable=False, index=True)
+    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
+    completed_at = Column(DateTime, default=datetime.utcnow)
+
+
 class Achievement(Base):
     __tablename__ = "achievements"
     
@@ -138,12 +232,21 @@ class Achievement(Base):
     user = relationship("User", back_populates="achievements")
 
 
+class CatalogState(Base):
+    """Single row holding the catalog version; bumped whenever courses, lessons or FAQs change"""
+    __tablename__ = "catalog_state"
+    
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, default=1, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
 class FAQ(Base):
     __tablename__ = "faqs"
     
     id = Column(Integer, primary_key=True, index=True)
     category = Column(String)
-    question = Column(Text, nullable=False)
+    question = Column(Text, unique=True, index=True, nullable=False)  # Seeding matches FAQs by question
     answer = Column(Text, nullable=False)
     order = Column(Integer, default=0)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,36 +1,47 @@
 """
 AI Service for interview questions, resume analysis, and feedback generation
 """
-import google.generativeai as genai
+import threading
 from app.core.config import settings
+from app.core.metrics import track_ai_call, record_ai_fallback
+from app.services import ats_analyzer
 import json
-from typing import List, Dict, Any
-
-# Configure Gemini AI
-genai.configure(api_key=settings.GEMINI_API_KEY)
+from typing import List, Dict, Any, Tuple
 
 
 class AIService:
     def __init__(self):
-        try:
-            # Only initialize if API key is valid (not placeholder)
-            if settings.GEMINI_API_KEY and settings.GEMINI_API_KEY != "your-gemini-api-key-here":
-                self.model = genai.GenerativeModel('gemini-pro')
-                self.use_ai = True
-            else:
-                self.model = None
-                self.use_ai = False
-                print("⚠️  Gemini API key not configured. Using fallback questions.")
-        except Exception as e:
-            self.model = None
-            self.use_ai = False
-            print(f"⚠️  AI Service initialization failed: {e}. Using fallback questions.")
+        # The Gemini client is imported and configured on first use (see `model`),
+        # which keeps google.generativeai out of server start-up
+        self._model = None
+        self._model_lock = threading.Lock()
+        # Only use the AI if the API key is valid (not placeholder)
+        self.use_ai = bool(settings.GEMINI_API_KEY) and settings.GEMINI_API_KEY != "your-gemini-api-key-here"
+        if not self.use_ai:
+            print("⚠️  Gemini API key not configured. Using fallback questions.")
+    
+    @property
+    def model(self):
+        """The Gemini model, or None if the AI is unavailable"""
+        if self._model is None and self.use_ai:
+            with self._model_lock:
+                if self._model is None and self.use_ai:
+                    try:
+                        import google.generativeai as genai
+                        genai.configure(api_key=settings.GEMINI_API_KEY)
+                        self._model = genai.GenerativeModel('gemini-pro')
+                    except Exception as e:
+                        self.use_ai = False
+                        print(f"⚠️  AI Service initialization failed: {e}. Using fallback questions.")
+        return self._model
     
+    @track_ai_call
     def generate_aptitude_questions(self, category: str, difficulty: str, count: int = 10) -> List[Dict]:
         """Generate aptitude test questions using AI"""
         
         # Use fallback if AI is not available
         if not self.use_ai or self.model is None:
+            record_ai_fallback()
             print(f"Using fallback questions for {category} - {difficulty}")
             return self._get_fallback_questions(category, difficulty, count)
         
@@ -59,10 +70,12 @@ class AIService:
             questions = json.loads(text)
             return questions[:count]
         except Exception as e:
+            record_ai_fallback()
             print(f"AI generation error: {e}")
             # Return fallback questions
             return self._get_fallback_questions(category, difficulty, count)
     
+    @track_ai_call
     def generate_interview_questions(self, role: str, difficulty: str, count: int = 5) -> List[Dict]:
         """Generate interview questions for a specific role"""
         prompt = f"""
@@ -89,9 +102,11 @@ class AIService:
             questions = json.loads(text)
             return questions[:count]
         except Exception as e:
+            record_ai_fallback()
             print(f"AI generation error: {e}")
             return self._get_fallback_interview_questions(role, count)
     
+    @track_ai_call
     def evaluate_interview_response(self, question: str, response: str, expected_points: List[str]) -> Dict:
         """Evaluate an interview response using AI"""
         prompt = f"""
@@ -122,6 +137,7 @@ class AIService:
             evaluation = json.loads(text)
             return evaluation
         except Exception as e:
+            record_ai_fallback()
             print(f"AI evaluation error: {e}")
             return {
                 "score": 70,
@@ -130,6 +146,7 @@ class AIService:
                 "improvements": ["Add more technical details"]
             }
 
+    @track_ai_call
     def generate_coding_problems(self, category: str, difficulty: str, language: str = "Python", count: int = 3) -> List[Dict]:
         """Generate coding problems using AI"""
         
@@ -172,6 +189,7 @@ class AIService:
             problems = json.loads(text)
             return problems[:count]
         except Exception as e:
+            record_ai_fallback()
             print(f"AI coding generation error: {e}")
             return [
                 {
@@ -200,6 +218,7 @@ class AIService:
                 }
             ]
 
+    @track_ai_call
     def generate_aptitude_tutorial(self, category: str, topic: str) -> Dict:
         """Generate an aptitude tutorial using AI"""
         prompt = f"""
@@ -229,6 +248,7 @@ class AIService:
             tutorial = json.loads(text)
             return tutorial
         except Exception as e:
+            record_ai_fallback()
             print(f"AI tutorial generation error: {e}")
             return {
                 "title": topic,
@@ -239,8 +259,12 @@ class AIService:
                 "tips": ["Practice regularly to improve speed and accuracy."]
             }
     
-    def analyze_resume(self, resume_text: str) -> Dict:
-        """Analyze resume and provide comprehensive feedback"""
+    @track_ai_call
+    def analyze_resume(self, resume_text: str) -> Tuple[Dict, bool]:
+        """
+        Analyze resume and provide comprehensive feedback.
+        Returns (analysis, used_ai); used_ai is False when the local analysis was returned instead.
+        """
         prompt = f"""
         Analyze this resume in detail and provide comprehensive feedback:
         
@@ -283,6 +307,12 @@ class AIService:
         Be specific, constructive, and actionable. Return ONLY valid JSON.
         """
         
+        # Deterministic first pass; the LLM only enriches it when available
+        local_analysis = ats_analyzer.analyze(resume_text)
+        if not self.use_ai or self.model is None:
+            record_ai_fallback()
+            return local_analysis, False
+
         try:
             response = self.model.generate_content(prompt)
             text = response.text.strip()
@@ -294,71 +324,19 @@ class AIService:
             
             analysis = json.loads(text)
             
-            # Ensure all required fields exist
-            if 'positive_points' not in analysis:
-                analysis['positive_points'] = []
-            if 'negative_points' not in analysis:
-                analysis['negative_points'] = []
-            if 'ats_analysis' not in analysis:
-                analysis['ats_analysis'] = {
-                    "formatting_score": analysis.get('ats_score', 75),
-                    "keyword_optimization": 70,
-                    "structure_score": 75,
-                    "readability_score": 80,
-                    "overall_feedback": "ATS analysis completed"
-                }
+            # Fill any fields the model left out from the local analysis
+            for key, value in local_analysis.items():
+                analysis.setdefault(key, value)
             if 'ats_friendly' not in analysis:
-                analysis['ats_friendly'] = analysis.get('ats_score', 75) >= 75
+                analysis['ats_friendly'] = analysis.get('ats_score', local_analysis['ats_score']) >= 75
                 
-            return analysis
+            return analysis, True
         except Exception as e:
+            record_ai_fallback()
             print(f"AI analysis error: {e}")
-            # Return comprehensive fallback with all fields
-            return {
-                "ats_score": 75,
-                "ats_friendly": True,
-                "ats_analysis": {
-                    "formatting_score": 75,
-                    "keyword_optimization": 70,
-                    "structure_score": 75,
-                    "readability_score": 80,
-                    "overall_feedback": "Resume has decent ATS compatibility. Standard formatting detected with room for improvement in keyword optimization."
-                },
-                "positive_points": [
-                    "Clean and professional formatting",
-                    "Technical skills are listed clearly",
-                    "Experience section is present",
-                    "Contact information is provided",
-                    "Structured layout is easy to follow"
-                ],
-                "negative_points": [
-                    "Could benefit from more quantifiable achievements (metrics, percentages)",
-                    "Some descriptions may be too generic",
-                    "Consider adding more industry-specific keywords",
-                    "Action verbs could be more impactful",
-                    "May need to highlight key accomplishments better"
-                ],
-                "skills": ["Python", "JavaScript", "SQL", "Communication", "Problem Solving"],
-                "experience_years": 2,
-                "strengths": [
-                    "Good technical foundation",
-                    "Clear structure and organization",
-                    "Professional presentation"
-                ],
-                "improvements": [
-                    "Add more quantifiable achievements with metrics",
-                    "Include specific technologies and tools used",
-                    "Expand on project outcomes and impact",
-                    "Add a projects section if missing",
-                    "Optimize with industry-relevant keywords",
-                    "Use stronger action verbs (Led, Architected, Optimized)",
-                    "Keep bullet points concise yet impactful"
-                ],
-                "missing_sections": ["Projects", "Certifications"],
-                "keywords_found": ["Python", "JavaScript", "Development"],
-                "keywords_missing": ["API", "Cloud", "Testing", "CI/CD", "Agile"]
-            }
+            return local_analysis, False
 
+    @track_ai_call
     def explain_lesson_concept(self, course_title: str, lesson_title: str, lesson_content: str) -> str:
         """Generate an AI explanation for a lesson concept."""
         prompt = f"""
@@ -380,8 +358,13 @@ class AIService:
             response = self.model.generate_content(prompt)
             return response.text.strip()
         except Exception as e:
+            record_ai_fallback()
             print(f"AI explanation error: {e}")
-            return f"**{lesson_title}**\n\nThis concept is fundamental to {course_title}. Please refer to the video and text content for a detailed explanation."
+            return self.fallback_lesson_explanation(course_title, lesson_title)
+    
+    def fallback_lesson_explanation(self, course_title: str, lesson_title: str) -> str:
+        """Generic explanation used when the AI is unavailable"""
+        return f"**{lesson_title}**\n\nThis concept is fundamental to {course_title}. Please refer to the video and text content for a detailed explanation."
     
     def _get_fallback_questions(self, category: str, difficulty: str, count: int) -> List[Dict]:
         """Fallback questions if AI fails"""
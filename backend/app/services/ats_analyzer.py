@@ -0,0 +1,282 @@
+"""
+Deterministic local ATS analysis.
+
+Scores a resume from its text alone: section detection, keyword matching
+against role dictionaries, formatting and readability metrics. It returns the
+same shape as AIService.analyze_resume in a few milliseconds, so it serves as
+the fast first pass and as the result whenever the LLM is unavailable.
+"""
+import re
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Section name -> heading variants
+SECTIONS = {
+    "Summary": ["summary", "professional summary", "profile", "objective", "about me", "career objective"],
+    "Experience": ["experience", "work experience", "professional experience", "employment history",
+                   "work history", "internships", "internship"],
+    "Education": ["education", "academic background", "academics", "qualifications"],
+    "Skills": ["skills", "technical skills", "core competencies", "technologies", "tech stack"],
+    "Projects": ["projects", "personal projects", "academic projects", "key projects"],
+    "Certifications": ["certifications", "certificates", "licenses", "courses"],
+    "Achievements": ["achievements", "awards", "honors", "accomplishments"],
+}
+CORE_SECTIONS = ["Experience", "Education", "Skills"]
+OPTIONAL_SECTIONS = ["Summary", "Projects", "Certifications"]
+
+ROLE_KEYWORDS = {
+    "Software Engineer": [
+        "python", "java", "javascript", "typescript", "c++", "go", "sql", "rest", "api", "microservices",
+        "git", "docker", "kubernetes", "aws", "azure", "gcp", "ci/cd", "unit testing", "agile",
+        "data structures", "algorithms", "system design", "linux", "react", "node.js", "spring",
+    ],
+    "Data Scientist": [
+        "python", "r", "sql", "pandas", "numpy", "scikit-learn", "tensorflow", "pytorch",
+        "machine learning", "deep learning", "statistics", "regression", "classification", "nlp",
+        "data visualization", "tableau", "power bi", "spark", "a/b testing", "feature engineering",
+    ],
+    "Frontend Developer": [
+        "javascript", "typescript", "react", "vue", "angular", "html", "css", "sass", "redux",
+        "webpack", "vite", "responsive design", "accessibility", "rest", "graphql", "jest", "figma",
+    ],
+    "DevOps Engineer": [
+        "linux", "bash", "docker", "kubernetes", "terraform", "ansible", "aws", "azure", "gcp",
+        "ci/cd", "jenkins", "github actions", "prometheus", "grafana", "monitoring", "networking",
+    ],
+    "Product Manager": [
+        "roadmap", "stakeholder", "user research", "product strategy", "agile", "scrum", "jira",
+        "kpi", "okr", "a/b testing", "analytics", "go-to-market", "prioritization", "requirements",
+    ],
+}
+
+ACTION_VERBS = [
+    "achieved", "architected", "automated", "built", "created", "delivered", "designed", "developed",
+    "drove", "engineered", "established", "implemented", "improved", "increased", "launched", "led",
+    "managed", "mentored", "migrated", "optimized", "owned", "reduced", "refactored", "resolved",
+    "scaled", "shipped", "spearheaded", "streamlined",
+]
+
+
+def build_trie_regex(words: Iterable[str]) -> "re.Pattern":
+    """
+    Compile words into a single case-insensitive regex shaped like a trie
+    (shared prefixes factored out), so each position in the text is matched
+    against all keywords in one pass without backtracking over alternatives.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word.lower():
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def to_pattern(node: Dict) -> str:
+        ends_here = "" in node
+        branches = [re.escape(char) + to_pattern(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if ends_here else body
+
+    # Keyword boundaries: not preceded/followed by a word character (handles c++, node.js)
+    return re.compile(r"(?<![\w+#])(" + to_pattern(trie) + r")(?![\w+#])", re.IGNORECASE)
+
+
+_ALL_KEYWORDS = sorted({kw for keywords in ROLE_KEYWORDS.values() for kw in keywords})
+_KEYWORD_PATTERN = build_trie_regex(_ALL_KEYWORDS)
+_ACTION_VERB_PATTERN = build_trie_regex(ACTION_VERBS)
+_HEADING_TO_SECTION = {heading: name for name, headings in SECTIONS.items() for heading in headings}
+_HEADING_PATTERN = re.compile(
+    r"^\s*(" + "|".join(sorted((re.escape(h) for h in _HEADING_TO_SECTION), key=len, reverse=True)) + r")\s*:?\s*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+_EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_PHONE_PATTERN = re.compile(r"(?:\+?\d[\d\s().-]{8,}\d)")
+_LINK_PATTERN = re.compile(r"(linkedin\.com|github\.com)", re.IGNORECASE)
+_BULLET_PATTERN = re.compile(r"^\s*[•●▪◦‣\-*–]\s+", re.MULTILINE)
+_METRIC_PATTERN = re.compile(r"\d+(?:\.\d+)?\s*(?:%|percent|x\b|k\b|m\b|\+)|\$\s?\d", re.IGNORECASE)
+_YEAR_RANGE_PATTERN = re.compile(
+    r"((?:19|20)\d{2})\s*(?:-|–|—|to)\s*((?:19|20)\d{2}|present|current|now)", re.IGNORECASE)
+_YEARS_STATED_PATTERN = re.compile(r"(\d{1,2})\+?\s*(?:years|yrs)", re.IGNORECASE)
+_SENTENCE_SPLIT = re.compile(r"[.!?]\s+|\n+")
+_WORD_PATTERN = re.compile(r"[A-Za-z][A-Za-z'+#.-]*")
+
+
+def _clamp(value: float) -> int:
+    return int(max(0, min(100, round(value))))
+
+
+def detect_sections(text: str) -> List[str]:
+    found = []
+    for match in _HEADING_PATTERN.finditer(text):
+        section = _HEADING_TO_SECTION[match.group(1).lower()]
+        if section not in found:
+            found.append(section)
+    return found
+
+
+def section_text(text: str, section: str) -> str:
+    """Text under the given section's headings, or "" if it has none"""
+    headings = list(_HEADING_PATTERN.finditer(text))
+    parts = []
+    for i, match in enumerate(headings):
+        if _HEADING_TO_SECTION[match.group(1).lower()] == section:
+            end = headings[i + 1].start() if i + 1 < len(headings) else len(text)
+            parts.append(text[match.end():end])
+    return "\n".join(parts)
+
+
+def match_keywords(text: str) -> List[str]:
+    """Distinct dictionary keywords present in the text, in canonical (lowercase) form"""
+    return sorted({match.group(1).lower() for match in _KEYWORD_PATTERN.finditer(text)})
+
+
+def estimate_experience_years(text: str) -> int:
+    stated = [int(m.group(1)) for m in _YEARS_STATED_PATTERN.finditer(text)]
+    current_year = datetime.utcnow().year
+    spans: List[Tuple[int, int]] = []
+    # Date ranges under Education would otherwise count as work experience
+    experience = section_text(text, "Experience") or text
+    for start, end in _YEAR_RANGE_PATTERN.findall(experience):
+        end_year = current_year if not end[0].isdigit() else int(end)
+        if int(start) <= end_year <= current_year:
+            spans.append((int(start), end_year))
+    from_ranges = (max(e for _, e in spans) - min(s for s, _ in spans)) if spans else 0
+    return max([from_ranges] + [s for s in stated if s <= 50])
+
+
+def _best_role(keywords: List[str], role: Optional[str]) -> str:
+    if role in ROLE_KEYWORDS:
+        return role
+    found = set(keywords)
+    return max(ROLE_KEYWORDS, key=lambda r: len(found.intersection(ROLE_KEYWORDS[r])))
+
+
+def analyze(text: str, role: Optional[str] = None) -> Dict:
+    """Local ATS analysis of resume text, in the shape returned by AIService.analyze_resume"""
+    words = _WORD_PATTERN.findall(text)
+    word_count = len(words)
+    lines = [line for line in text.splitlines() if line.strip()]
+
+    # Structure
+    sections = detect_sections(text)
+    missing_core = [s for s in CORE_SECTIONS if s not in sections]
+    missing_optional = [s for s in OPTIONAL_SECTIONS if s not in sections]
+    structure_score = _clamp(
+        60 * (len(CORE_SECTIONS) - len(missing_core)) / len(CORE_SECTIONS)
+        + 40 * (len(OPTIONAL_SECTIONS) - len(missing_optional)) / len(OPTIONAL_SECTIONS)
+    )
+
+    # Keywords
+    keywords = match_keywords(text)
+    best_role = _best_role(keywords, role)
+    role_keywords = ROLE_KEYWORDS[best_role]
+    role_found = [kw for kw in role_keywords if kw in keywords]
+    role_missing = [kw for kw in role_keywords if kw not in keywords]
+    keyword_score = _clamp(100 * len(role_found) / min(12, len(role_keywords)))
+
+    # Formatting
+    has_email = bool(_EMAIL_PATTERN.search(text))
+    has_phone = bool(_PHONE_PATTERN.search(text))
+    has_links = bool(_LINK_PATTERN.search(text))
+    bullet_count = len(_BULLET_PATTERN.findall(text))
+    long_lines = sum(1 for line in lines if len(line) > 160)
+    odd_chars = sum(1 for char in text if not (char.isascii() or char in "•●▪◦‣–—’“”"))
+    formatting_score = 100
+    formatting_score -= 0 if has_email else 20
+    formatting_score -= 0 if has_phone else 10
+    formatting_score -= 0 if bullet_count >= 3 else 10
+    formatting_score -= min(20, 4 * long_lines)
+    formatting_score -= min(20, 200 * odd_chars / max(1, len(text)))
+    if word_count < 150:
+        formatting_score -= 20
+    elif word_count > 1200:
+        formatting_score -= 10
+    formatting_score = _clamp(formatting_score)
+
+    # Readability
+    sentences = [s for s in _SENTENCE_SPLIT.split(text) if _WORD_PATTERN.search(s)]
+    avg_sentence_words = word_count / max(1, len(sentences))
+    action_verbs = {m.group(1).lower() for m in _ACTION_VERB_PATTERN.finditer(text)}
+    metrics_count = len(_METRIC_PATTERN.findall(text))
+    readability_score = 100
+    if avg_sentence_words > 25:
+        readability_score -= min(30, 2 * (avg_sentence_words - 25))
+    readability_score -= 0 if len(action_verbs) >= 5 else 5 * (5 - len(action_verbs))
+    readability_score -= 0 if metrics_count >= 3 else 5 * (3 - metrics_count)
+    readability_score = _clamp(readability_score)
+
+    ats_score = _clamp(
+        0.3 * keyword_score + 0.25 * structure_score + 0.25 * formatting_score + 0.2 * readability_score
+    )
+
+    positive_points, negative_points, improvements = [], [], []
+    present_core = [s for s in CORE_SECTIONS if s in sections]
+    if present_core:
+        positive_points.append(f"Standard sections detected: {', '.join(present_core)}")
+    if missing_core:
+        negative_points.append(f"Missing standard sections: {', '.join(missing_core)}")
+        improvements.append(f"Add clearly labelled {', '.join(missing_core)} section(s) so ATS parsers can find them")
+    if len(role_found) >= 8:
+        positive_points.append(f"Strong keyword coverage for {best_role} roles ({len(role_found)} keywords)")
+    else:
+        negative_points.append(f"Limited {best_role} keywords ({len(role_found)} found)")
+        improvements.append(f"Work in relevant keywords such as {', '.join(role_missing[:5])} where they apply")
+    if has_email and has_phone:
+        positive_points.append("Contact information (email and phone) is present")
+    else:
+        negative_points.append("Contact information is incomplete")
+        improvements.append("Include an email address and phone number at the top")
+    if has_links:
+        positive_points.append("Professional profile links (LinkedIn/GitHub) included")
+    else:
+        improvements.append("Add LinkedIn and GitHub profile links")
+    if metrics_count >= 3:
+        positive_points.append(f"Quantified achievements ({metrics_count} metrics found)")
+    else:
+        negative_points.append("Few quantifiable achievements (numbers, percentages)")
+        improvements.append("Quantify results, e.g. 'reduced latency by 40%' or 'served 1M users'")
+    if len(action_verbs) >= 5:
+        positive_points.append("Uses strong action verbs")
+    else:
+        negative_points.append("Could use more impactful action verbs")
+        improvements.append("Start bullet points with action verbs (Led, Built, Optimized, Delivered)")
+    if bullet_count >= 3:
+        positive_points.append("Bullet points make the content easy to scan")
+    else:
+        negative_points.append("Little use of bullet points")
+        improvements.append("Use concise bullet points instead of long paragraphs")
+    if word_count < 150:
+        negative_points.append("Resume is very brief")
+    elif word_count > 1200:
+        negative_points.append("Resume is long; consider trimming to one or two pages")
+    if long_lines:
+        negative_points.append("Some lines are very long, possibly from tables or multi-column layout")
+
+    feedback = (
+        f"Local ATS check: {ats_score}/100. "
+        f"{len(sections)} standard section(s) detected, {len(role_found)} {best_role} keywords matched, "
+        f"{metrics_count} quantified achievement(s)."
+    )
+
+    return {
+        "ats_score": ats_score,
+        "ats_friendly": ats_score >= 75,
+        "ats_analysis": {
+            "formatting_score": formatting_score,
+            "keyword_optimization": keyword_score,
+            "structure_score": structure_score,
+            "readability_score": readability_score,
+            "overall_feedback": feedback,
+        },
+        "positive_points": positive_points,
+        "negative_points": negative_points,
+        "skills": keywords,
+        "experience_years": estimate_experience_years(text),
+        "strengths": positive_points[:5],
+        "improvements": improvements,
+        "missing_sections": missing_core + missing_optional,
+        "keywords_found": role_found,
+        "keywords_missing": role_missing[:10],
+        "detected_role": best_role,
+    }
@@ -0,0 +1,260 @@
+"""
+Content-addressed storage for uploaded files.
+
+Each upload is stored once under the SHA-256 of its bytes, sharded into
+subdirectories (ab/cd/abcd...) so no directory grows unbounded. The
+stored_blobs table counts the rows that point at each blob; a blob is only
+removed when its last reference is released.
+
+Where the bytes live is pluggable: sharded files under UPLOAD_DIR, or any
+S3-compatible object store (STORAGE_BACKEND=s3). Without S3_ENDPOINT_URL the
+S3 backend talks to a local stand-in that keeps objects on disk, which is
+handy for development and tests.
+"""
+import os
+import re
+import shutil
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Optional
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.models import StoredBlob
+
+_BLOB_KEY = re.compile(r"^[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}$")
+
+
+def blob_key(content_hash: str) -> str:
+    """Sharded storage key for a SHA-256 hex digest"""
+    return f"{content_hash[:2]}/{content_hash[2:4]}/{content_hash}"
+
+
+def is_blob_key(path: str) -> bool:
+    """False for file paths saved before content-addressed storage"""
+    return bool(_BLOB_KEY.match(path or ""))
+
+
+class StorageBackend(ABC):
+    """Where blob bytes live. Keys are relative paths from blob_key()."""
+
+    @abstractmethod
+    def put_file(self, key: str, source_path: str):
+        """Move a finished local file into storage under key"""
+
+    @abstractmethod
+    def open(self, key: str) -> BinaryIO:
+        ...
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str):
+        ...
+
+    def local_path(self, key: str) -> Optional[str]:
+        """Filesystem path of the blob if it has one (lets it be served with sendfile)"""
+        return None
+
+
+class LocalStorage(StorageBackend):
+    """Blobs as files in hash-sharded subdirectories of root"""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def local_path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+    def put_file(self, key: str, source_path: str):
+        path = self.local_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(source_path, path)
+
+    def open(self, key: str) -> BinaryIO:
+        return open(self.local_path(key), "rb")
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.local_path(key))
+
+    def delete(self, key: str):
+        try:
+            os.remove(self.local_path(key))
+        except FileNotFoundError:
+            pass
+
+
+class LocalObjectStore:
+    """
+    Minimal stand-in for an S3 client (put_object/get_object/head_object/
+    delete_object) that keeps each bucket in a directory.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, bucket: str, key: str) -> str:
+        return os.path.join(self.root, bucket, *key.split("/"))
+
+    def put_object(self, Bucket: str, Key: str, Body: BinaryIO):
+        path = self._path(Bucket, Key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial_path = f"{path}.{uuid.uuid4().hex}.part"
+        with open(partial_path, "wb") as f:
+            shutil.copyfileobj(Body, f)
+        os.replace(partial_path, path)
+
+    def get_object(self, Bucket: str, Key: str) -> dict:
+        return {"Body": open(self._path(Bucket, Key), "rb")}
+
+    def head_object(self, Bucket: str, Key: str) -> dict:
+        return {"ContentLength": os.path.getsize(self._path(Bucket, Key))}
+
+    def delete_object(self, Bucket: str, Key: str):
+        try:
+            os.remove(self._path(Bucket, Key))
+        except FileNotFoundError:
+            pass
+
+
+class ObjectStorage(StorageBackend):
+    """Blobs as objects in an S3-compatible bucket"""
+
+    def __init__(self, client, bucket: str):
+        self.client = client
+        self.bucket = bucket
+
+    def put_file(self, key: str, source_path: str):
+        with open(source_path, "rb") as f:
+            self.client.put_object(Bucket=self.bucket, Key=key, Body=f)
+        os.remove(source_path)
+
+    def open(self, key: str) -> BinaryIO:
+        return self.client.get_object(Bucket=self.bucket, Key=key)["Body"]
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except Exception:
+            return False
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+
+def _create_backend() -> StorageBackend:
+    if settings.STORAGE_BACKEND == "s3":
+        if settings.S3_ENDPOINT_URL:
+            try:
+                import boto3
+            except ImportError:
+                raise RuntimeError("STORAGE_BACKEND=s3 with S3_ENDPOINT_URL requires boto3 (pip install boto3)")
+            client = boto3.client("s3", endpoint_url=settings.S3_ENDPOINT_URL)
+        else:
+            client = LocalObjectStore(os.path.join(settings.UPLOAD_DIR, "s3"))
+        return ObjectStorage(client, settings.S3_BUCKET)
+    return LocalStorage(os.path.join(settings.UPLOAD_DIR, "blobs"))
+
+
+_backend: Optional[StorageBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> StorageBackend:
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = _create_backend()
+        return _backend
+
+
+def staging_path() -> str:
+    """Unique local path to stream an upload into before it is stored"""
+    staging_dir = os.path.join(settings.UPLOAD_DIR, "tmp")
+    os.makedirs(staging_dir, exist_ok=True)
+    return os.path.join(staging_dir, f"{uuid.uuid4().hex}.part")
+
+
+def _increment(db: Session, content_hash: str) -> bool:
+    return db.query(StoredBlob).filter(StoredBlob.content_hash == content_hash).update(
+        {"ref_count": StoredBlob.ref_count + 1}, synchronize_session=False
+    ) == 1
+
+
+def add_reference(db: Session, source_path: str, content_hash: str, size: int) -> str:
+    """
+    Store the file at source_path (consuming it) under its content hash, or add
+    a reference if the blob already exists. Returns the blob key.
+    The caller commits.
+    """
+    backend = get_backend()
+    key = blob_key(content_hash)
+
+    if _increment(db, content_hash):
+        if backend.exists(key):
+            os.remove(source_path)
+        else:
+            backend.put_file(key, source_path)  # Blob went missing; restore it
+        return key
+
+    backend.put_file(key, source_path)
+    try:
+        with db.begin_nested():
+            db.add(StoredBlob(content_hash=content_hash, key=key, size=size, ref_count=1))
+    except IntegrityError:
+        # Another upload of the same bytes got there first
+        _increment(db, content_hash)
+    return key
+
+
+def release(db: Session, key: str) -> bool:
+    """
+    Drop one reference to the blob, deleting it once nothing points at it.
+    Returns False if key is not a tracked blob (e.g. a legacy file path).
+    The caller commits; the bytes are only deleted once that commit succeeds.
+    """
+    if not is_blob_key(key):
+        return False
+    updated = db.query(StoredBlob).filter(StoredBlob.key == key).update(
+        {"ref_count": StoredBlob.ref_count - 1}, synchronize_session=False
+    )
+    if not updated:
+        return False
+    unused = db.query(StoredBlob).filter(StoredBlob.key == key, StoredBlob.ref_count <= 0).first()
+    if unused:
+        db.delete(unused)
+        db.flush()
+        db.info.setdefault("blob_deletions", []).append(key)
+    return True
+
+
+@event.listens_for(Session, "after_commit")
+def _delete_released(session):
+    for key in session.info.pop("blob_deletions", []):
+        try:
+            get_backend().delete(key)
+        except Exception as e:
+            # The row is gone either way; a leftover file only costs space
+            print(f"Blob delete error ({key}): {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _keep_released(session):
+    session.info.pop("blob_deletions", None)
+
+
+def read(path: str) -> bytes:
+    """Bytes of a stored upload, by blob key or legacy file path"""
+    if not is_blob_key(path):
+        with open(path, "rb") as f:
+            return f.read()
+    f = get_backend().open(path)
+    try:
+        return f.read()
+    finally:
+        f.close()
@@ -0,0 +1,108 @@
+"""
+In-memory snapshots of the read-only catalog endpoints (courses, course
+details with lessons, FAQs).
+
+Each response body is built once per catalog version, serialized to bytes and
+served with a strong ETag, so repeat requests are a dictionary lookup and
+clients revalidate with If-None-Match for a 304. Larger bodies are also
+compressed once (gzip, and brotli when installed) and the variant the client
+accepts is sent as-is. The version lives in the
+catalog_state table: anything that changes the catalog calls bump_version(),
+and every worker notices within CATALOG_VERSION_CHECK_INTERVAL seconds and
+drops its snapshots.
+"""
+import hashlib
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, NamedTuple, Optional
+from fastapi import Request, Response
+from sqlalchemy.orm import Session
+from app.core import compression
+from app.core.config import settings
+from app.core.file_responses import etag_matches
+from app.core.metrics import record_cache_lookup
+from app.core.responses import dumps
+from app.models.models import CatalogState
+
+CACHE_CONTROL = "public, max-age=0, must-revalidate"
+
+_lock = threading.Lock()
+_version: Optional[int] = None
+_checked_at = 0.0
+_snapshots: Dict[str, "Snapshot"] = {}
+
+
+class Snapshot(NamedTuple):
+    etag: str
+    body: bytes
+    encoded: Dict[str, bytes]  # encoding -> compressed body
+
+
+def _read_version(db: Session) -> int:
+    version = db.query(CatalogState.version).filter(CatalogState.id == 1).scalar()
+    return version or 0
+
+
+def _set_version(version: int):
+    global _version, _checked_at
+    with _lock:
+        if version != _version:
+            _snapshots.clear()
+            _version = version
+        _checked_at = time.monotonic()
+
+
+def current_version(db: Session) -> int:
+    """Catalog version, re-read from the database at most every CATALOG_VERSION_CHECK_INTERVAL seconds"""
+    if _version is None or time.monotonic() - _checked_at >= settings.CATALOG_VERSION_CHECK_INTERVAL:
+        _set_version(_read_version(db))
+    return _version
+
+
+def bump_version(db: Session):
+    """Invalidate catalog snapshots in every worker. Commits."""
+    updated = db.query(CatalogState).filter(CatalogState.id == 1).update(
+        {"version": CatalogState.version + 1, "updated_at": datetime.utcnow()},
+        synchronize_session=False
+    )
+    if not updated:
+        db.add(CatalogState(id=1, version=1))
+    db.commit()
+    _set_version(_read_version(db))
+
+
+def respond(
+    request: Request,
+    db: Session,
+    key: str,
+    build: Callable[[], dict],
+    cache_control: str = CACHE_CONTROL
+) -> Response:
+    """
+    Serve the snapshot for key, building it with build() on a miss.
+    Nothing is cached if build() raises (e.g. HTTPException 404).
+    """
+    version = current_version(db)
+    snapshot = _snapshots.get(key)
+    record_cache_lookup("catalog", snapshot is not None)
+    if snapshot is None:
+        body = dumps(build())
+        etag = f'"{version}-{hashlib.sha256(body).hexdigest()[:16]}"'
+        snapshot = Snapshot(etag, body, compression.precompress(body))
+        with _lock:
+            if _version == version:
+                _snapshots[key] = snapshot
+
+    encoding = compression.choose_encoding(request.headers.get("accept-encoding"), snapshot.encoded)
+    # Each encoding is a different representation, so it gets its own ETag
+    etag = f'{snapshot.etag[:-1]}-{encoding}"' if encoding else snapshot.etag
+    headers = {"etag": etag, "cache-control": cache_control}
+    if snapshot.encoded:
+        headers["vary"] = "Accept-Encoding"
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["content-encoding"] = encoding
+        return Response(content=snapshot.encoded[encoding], media_type="application/json", headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
@@ -0,0 +1,161 @@
+"""
+Full-text search over FAQs.
+
+On SQLite the faqs table is mirrored into an FTS5 index (kept in sync by
+triggers) and results are ranked with BM25, questions weighted above
+answers. On PostgreSQL a generated tsvector column with a GIN index plays the
+same role. Where neither is available, search falls back to a
+case-insensitive LIKE scan.
+"""
+import re
+from typing import List
+from sqlalchemy import func, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from app.models.models import FAQ
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+SNIPPET_TOKENS = 16
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+_backend = "like"  # "fts5", "postgres" or "like", chosen by install()
+
+_FTS5_SETUP = [
+    """CREATE VIRTUAL TABLE faqs_fts USING fts5(
+        question, answer,
+        content='faqs', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )""",
+    """CREATE TRIGGER faqs_fts_insert AFTER INSERT ON faqs BEGIN
+        INSERT INTO faqs_fts(rowid, question, answer) VALUES (new.id, new.question, new.answer);
+    END""",
+    """CREATE TRIGGER faqs_fts_delete AFTER DELETE ON faqs BEGIN
+        INSERT INTO faqs_fts(faqs_fts, rowid, question, answer) VALUES ('delete', old.id, old.question, old.answer);
+    END""",
+    """CREATE TRIGGER faqs_fts_update AFTER UPDATE ON faqs BEGIN
+        INSERT INTO faqs_fts(faqs_fts, rowid, question, answer) VALUES ('delete', old.id, old.question, old.answer);
+        INSERT INTO faqs_fts(rowid, question, answer) VALUES (new.id, new.question, new.answer);
+    END""",
+    # Index the rows that existed before the triggers
+    "INSERT INTO faqs_fts(faqs_fts) VALUES ('rebuild')",
+]
+
+# Undo a partial setup; SQLite DDL isn't rolled back with the transaction by the driver
+_FTS5_TEARDOWN = [
+    "DROP TRIGGER IF EXISTS faqs_fts_insert",
+    "DROP TRIGGER IF EXISTS faqs_fts_delete",
+    "DROP TRIGGER IF EXISTS faqs_fts_update",
+    "DROP TABLE IF EXISTS faqs_fts",
+]
+
+_POSTGRES_SETUP = [
+    """ALTER TABLE faqs ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(question, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(answer, '')), 'B')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_faqs_search_vector ON faqs USING gin (search_vector)",
+]
+
+
+def install(bind: Engine):
+    """Create the search index for this database if it is missing"""
+    global _backend
+    dialect = bind.dialect.name
+    try:
+        if dialect == "sqlite":
+            if "faqs_fts" not in inspect(bind).get_table_names():
+                with bind.begin() as conn:
+                    for statement in _FTS5_SETUP:
+                        conn.execute(text(statement))
+            _backend = "fts5"
+        elif dialect == "postgresql":
+            with bind.begin() as conn:
+                for statement in _POSTGRES_SETUP:
+                    conn.execute(text(statement))
+            _backend = "postgres"
+    except OperationalError as e:
+        # e.g. SQLite built without FTS5
+        print(f"FAQ full-text search unavailable, using LIKE: {e}")
+        _backend = "like"
+        if dialect == "sqlite":
+            # Otherwise the next start would find faqs_fts and trust an index without its triggers
+            with bind.begin() as conn:
+                for statement in _FTS5_TEARDOWN:
+                    conn.execute(text(statement))
+
+
+def _terms(query: str) -> List[str]:
+    return _TERM.findall(query.lower())
+
+
+def _fts5_query(terms: List[str]) -> str:
+    # Quote every term so user input can't inject FTS syntax; the last one is a prefix
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def _postgres_query(terms: List[str]) -> str:
+    return " & ".join(f"{term}:*" if i == len(terms) - 1 else term for i, term in enumerate(terms))
+
+
+def _search_fts5(db: Session, terms: List[str], limit: int) -> List[dict]:
+    rows = db.execute(text(f"""
+        SELECT faqs.id, faqs.category, faqs.question, faqs.answer,
+               highlight(faqs_fts, 0, :start, :end) AS question_highlight,
+               snippet(faqs_fts, 1, :start, :end, '…', {SNIPPET_TOKENS}) AS snippet
+        FROM faqs_fts
+        JOIN faqs ON faqs.id = faqs_fts.rowid
+        WHERE faqs_fts MATCH :query
+        ORDER BY bm25(faqs_fts, 10.0, 1.0)
+        LIMIT :limit
+    """), {"query": _fts5_query(terms), "start": HIGHLIGHT_START, "end": HIGHLIGHT_END, "limit": limit})
+    return [dict(row._mapping) for row in rows]
+
+
+def _search_postgres(db: Session, terms: List[str], limit: int) -> List[dict]:
+    options = f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, MaxWords={SNIPPET_TOKENS}, MinWords=5"
+    rows = db.execute(text("""
+        SELECT id, category, question, answer,
+               ts_headline('english', question, q, :options) AS question_highlight,
+               ts_headline('english', answer, q, :options) AS snippet
+        FROM faqs, to_tsquery('english', :query) AS q
+        WHERE search_vector @@ q
+        ORDER BY ts_rank_cd(search_vector, q) DESC
+        LIMIT :limit
+    """), {"query": _postgres_query(terms), "options": options, "limit": limit})
+    return [dict(row._mapping) for row in rows]
+
+
+def _search_like(db: Session, query: str, limit: int) -> List[dict]:
+    pattern = f"%{query.lower()}%"
+    faqs = db.query(FAQ).filter(
+        func.lower(FAQ.question).like(pattern) | func.lower(FAQ.answer).like(pattern)
+    ).order_by(FAQ.order).limit(limit).all()
+    return [
+        {
+            "id": faq.id,
+            "category": faq.category,
+            "question": faq.question,
+            "answer": faq.answer,
+            "question_highlight": None,
+            "snippet": None
+        }
+        for faq in faqs
+    ]
+
+
+def search(db: Session, query: str, limit: int = 20) -> List[dict]:
+    """Best matches first, with highlighted question and answer snippet where supported"""
+    terms = _terms(query)
+    if not terms:
+        return []
+    if _backend == "fts5":
+        return _search_fts5(db, terms, limit)
+    if _backend == "postgres":
+        return _search_postgres(db, terms, limit)
+    return _search_like(db, query.strip(), limit)
@@ -0,0 +1,136 @@
+"""
+Stored AI explanations for lessons.
+
+Lesson content is static, so each lesson's explanation is generated once
+(ahead of time by generate_explanations.py, or on first request) and stored
+with a hash of the course title, lesson title and content it was generated
+from. It is regenerated only when that hash changes.
+"""
+import asyncio
+import hashlib
+from datetime import datetime
+from typing import Callable, Dict, Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.database import SessionLocal
+from app.models.models import Course, Lesson, LessonExplanation
+from app.services.ai_service import ai_service
+
+# Bump when the explanation prompt changes so stored explanations are regenerated
+PROMPT_VERSION = 1
+
+
+def lesson_hash(course_title: str, lesson_title: str, lesson_content: Optional[str]) -> str:
+    source = "\0".join([str(PROMPT_VERSION), course_title or "", lesson_title or "", lesson_content or ""])
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def get_stored(db: Session, lesson_id: int, content_hash: str) -> Optional[str]:
+    """The stored explanation if it was generated from this exact content"""
+    return db.query(LessonExplanation.explanation).filter(
+        LessonExplanation.lesson_id == lesson_id,
+        LessonExplanation.content_hash == content_hash
+    ).scalar()
+
+
+def store(db: Session, lesson_id: int, content_hash: str, explanation: str):
+    """Insert or replace the lesson's explanation. Commits."""
+    values = {"content_hash": content_hash, "explanation": explanation, "updated_at": datetime.utcnow()}
+    updated = db.query(LessonExplanation).filter(LessonExplanation.lesson_id == lesson_id).update(
+        values, synchronize_session=False
+    )
+    if not updated:
+        try:
+            with db.begin_nested():
+                db.add(LessonExplanation(lesson_id=lesson_id, **values))
+        except IntegrityError:
+            # Generated concurrently for the same lesson; keep the newest
+            db.query(LessonExplanation).filter(LessonExplanation.lesson_id == lesson_id).update(
+                values, synchronize_session=False
+            )
+    db.commit()
+
+
+def _is_fallback(explanation: str, course_title: str, lesson_title: str) -> bool:
+    return explanation == ai_service.fallback_lesson_explanation(course_title, lesson_title)
+
+
+async def generate(db: Session, lesson_id: int, course_title: str, lesson_title: str, lesson_content: str) -> str:
+    """
+    Generate an explanation (the LLM call runs in a thread) and store it.
+    The generic fallback is returned but not stored, so it is replaced once the AI is available.
+    """
+    explanation = await asyncio.to_thread(
+        ai_service.explain_lesson_concept,
+        course_title=course_title,
+        lesson_title=lesson_title,
+        lesson_content=lesson_content
+    )
+    if not _is_fallback(explanation, course_title, lesson_title):
+        store(db, lesson_id, lesson_hash(course_title, lesson_title, lesson_content), explanation)
+    return explanation
+
+
+async def get_or_generate(db: Session, lesson: Lesson, course_title: str) -> str:
+    stored = get_stored(db, lesson.id, lesson_hash(course_title, lesson.title, lesson.content))
+    if stored is not None:
+        return stored
+    return await generate(db, lesson.id, course_title, lesson.title, lesson.content)
+
+
+async def pregenerate(
+    concurrency: int = 4,
+    force: bool = False,
+    course_id: Optional[int] = None,
+    progress: Optional[Callable[[int, int, str, str], None]] = None
+) -> Dict[str, int]:
+    """
+    Generate explanations for every lesson that has none or whose content changed,
+    with at most `concurrency` LLM calls in flight.
+    """
+    if not ai_service.use_ai:
+        raise RuntimeError("Gemini API key not configured; set GEMINI_API_KEY to generate explanations")
+
+    db = SessionLocal()
+    try:
+        query = db.query(Lesson.id, Lesson.title, Lesson.content, Course.title.label("course_title")).join(
+            Course, Course.id == Lesson.course_id
+        )
+        if course_id is not None:
+            query = query.filter(Lesson.course_id == course_id)
+        lessons = query.order_by(Lesson.course_id, Lesson.order).all()
+        stored_hashes = dict(db.query(LessonExplanation.lesson_id, LessonExplanation.content_hash).all())
+    finally:
+        db.close()
+
+    todo = [
+        lesson for lesson in lessons
+        if force or stored_hashes.get(lesson.id) != lesson_hash(lesson.course_title, lesson.title, lesson.content)
+    ]
+    counts = {"lessons": len(lessons), "up_to_date": len(lessons) - len(todo), "generated": 0, "failed": 0}
+    slots = asyncio.Semaphore(concurrency)
+    done = 0
+
+    async def run(lesson):
+        nonlocal done
+        async with slots:
+            session = SessionLocal()
+            try:
+                explanation = await generate(session, lesson.id, lesson.course_title, lesson.title, lesson.content)
+                if _is_fallback(explanation, lesson.course_title, lesson.title):
+                    counts["failed"] += 1
+                    outcome = "failed: AI unavailable"
+                else:
+                    counts["generated"] += 1
+                    outcome = "generated"
+            except Exception as e:
+                counts["failed"] += 1
+                outcome = f"failed: {e}"
+            finally:
+                session.close()
+        done += 1
+        if progress:
+            progress(done, len(todo), lesson.title, outcome)
+
+    await asyncio.gather(*(run(lesson) for lesson in todo))
+    return counts
@@ -0,0 +1,51 @@
+"""
+Rendered lesson HTML.
+
+Lesson markdown is rendered to sanitized HTML once and stored on the lesson
+next to its source, together with a hash of the content it came from. It is
+rendered again only when the content (or the renderer) changes.
+"""
+import hashlib
+from typing import Optional
+from sqlalchemy.orm import Session, undefer
+from app.models.models import Lesson
+from app.services import markdown_renderer
+
+# Bump when markdown_renderer output changes so stored HTML is re-rendered
+RENDER_VERSION = 1
+
+
+def content_hash(content: Optional[str]) -> str:
+    source = f"{RENDER_VERSION}\0{content or ''}"
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def ensure_rendered(db: Session, lesson: Lesson) -> str:
+    """The lesson's HTML, rendering and storing it if missing or stale. Commits when it renders."""
+    expected = content_hash(lesson.content)
+    if lesson.content_html_hash == expected and lesson.content_html is not None:
+        return lesson.content_html
+
+    html = markdown_renderer.render(lesson.content)
+    # Bulk update, so the lesson isn't marked dirty (and re-indexed for search) for a derived column
+    db.query(Lesson).filter(Lesson.id == lesson.id).update(
+        {"content_html": html, "content_html_hash": expected}, synchronize_session=False
+    )
+    db.commit()
+    return html
+
+
+def render_all(db: Session) -> int:
+    """Render every lesson whose stored HTML is missing or stale. Returns how many were rendered."""
+    rendered = 0
+    for lesson in db.query(Lesson).options(undefer(Lesson.content_html)).all():
+        expected = content_hash(lesson.content)
+        if lesson.content_html_hash != expected or lesson.content_html is None:
+            db.query(Lesson).filter(Lesson.id == lesson.id).update(
+                {"content_html": markdown_renderer.render(lesson.content), "content_html_hash": expected},
+                synchronize_session=False
+            )
+            rendered += 1
+    if rendered:
+        db.commit()
+    return rendered
@@ -0,0 +1,140 @@
+"""
+Markdown to HTML for lesson content.
+
+Covers the subset lessons use: headings, paragraphs, bold/italic, inline
+code, fenced code blocks, ordered/unordered lists, blockquotes, rules and
+links. All text is HTML-escaped before any markup is added, so the output
+can only contain the tags generated here; links are limited to http(s),
+mailto and site-relative URLs.
+"""
+import html
+import re
+import textwrap
+from typing import List
+
+SAFE_LINK_PREFIXES = ("http://", "https://", "mailto:", "/", "#")
+
+_FENCE = re.compile(r"^```\s*([\w+-]*)\s*$")
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_UNORDERED = re.compile(r"^[-*+]\s+(.*)$")
+_ORDERED = re.compile(r"^\d+[.)]\s+(.*)$")
+_QUOTE = re.compile(r"^>\s?(.*)$")
+_RULE = re.compile(r"^(?:-{3,}|\*{3,}|_{3,})$")
+
+_CODE_SPAN = re.compile(r"`([^`]+)`")
+_LINK = re.compile(r"\[([^\]]+)\]\(([^)\s]+)\)")
+_BOLD = re.compile(r"\*\*(?=\S)(.+?)(?<=\S)\*\*|__(?=\S)(.+?)(?<=\S)__")
+_ITALIC = re.compile(r"(?<![\w*])\*(?=\S)(.+?)(?<=\S)\*(?!\*)|(?<![\w_])_(?=\S)(.+?)(?<=\S)_(?![\w_])")
+
+
+def _link(match: "re.Match") -> str:
+    text, url = match.group(1), html.unescape(match.group(2))
+    if not url.lower().startswith(SAFE_LINK_PREFIXES):
+        return text
+    return f'<a href="{html.escape(url, quote=True)}" rel="noopener noreferrer">{text}</a>'
+
+
+def render_inline(text: str) -> str:
+    """Escape text and apply inline markup; code spans are left verbatim"""
+    parts = []
+    for i, piece in enumerate(_CODE_SPAN.split(text)):
+        if i % 2:
+            parts.append(f"<code>{html.escape(piece)}</code>")
+            continue
+        piece = html.escape(piece, quote=True)
+        piece = _LINK.sub(_link, piece)
+        piece = _BOLD.sub(lambda m: f"<strong>{m.group(1) or m.group(2)}</strong>", piece)
+        piece = _ITALIC.sub(lambda m: f"<em>{m.group(1) or m.group(2)}</em>", piece)
+        parts.append(piece)
+    return "".join(parts)
+
+
+def render(markdown: str) -> str:
+    lines = textwrap.dedent(markdown or "").strip().splitlines()
+    out: List[str] = []
+    paragraph: List[str] = []
+    list_tag = None
+    quote: List[str] = []
+
+    def close_paragraph():
+        if paragraph:
+            out.append(f"<p>{render_inline(' '.join(paragraph))}</p>")
+            paragraph.clear()
+
+    def close_list():
+        nonlocal list_tag
+        if list_tag:
+            out.append(f"</{list_tag}>")
+            list_tag = None
+
+    def close_quote():
+        if quote:
+            out.append(f"<blockquote><p>{render_inline(' '.join(quote))}</p></blockquote>")
+            quote.clear()
+
+    def close_all():
+        close_paragraph()
+        close_list()
+        close_quote()
+
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+        i += 1
+
+        fence = _FENCE.match(line)
+        if fence:
+            close_all()
+            code = []
+            while i < len(lines) and not lines[i].strip().startswith("```"):
+                code.append(lines[i])
+                i += 1
+            i += 1  # Closing fence
+            language = f' class="language-{fence.group(1)}"' if fence.group(1) else ""
+            out.append(f"<pre><code{language}>{html.escape(textwrap.dedent(chr(10).join(code)))}</code></pre>")
+            continue
+
+        if not line:
+            close_all()
+            continue
+
+        if _RULE.match(line):
+            close_all()
+            out.append("<hr>")
+            continue
+
+        heading = _HEADING.match(line)
+        if heading:
+            close_all()
+            level = len(heading.group(1))
+            out.append(f"<h{level}>{render_inline(heading.group(2))}</h{level}>")
+            continue
+
+        item = _UNORDERED.match(line)
+        tag = "ul"
+        if not item:
+            item = _ORDERED.match(line)
+            tag = "ol"
+        if item:
+            close_paragraph()
+            close_quote()
+            if list_tag != tag:
+                close_list()
+                out.append(f"<{tag}>")
+                list_tag = tag
+            out.append(f"<li>{render_inline(item.group(1))}</li>")
+            continue
+
+        quoted = _QUOTE.match(line)
+        if quoted:
+            close_paragraph()
+            close_list()
+            quote.append(quoted.group(1))
+            continue
+
+        close_list()
+        close_quote()
+        paragraph.append(line)
+
+    close_all()
+    return "\n".join(out)
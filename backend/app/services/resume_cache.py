@@ -0,0 +1,61 @@
+"""
+Content-hash deduplication for resume analysis.
+
+Uploads are keyed by the SHA-256 of their bytes; when the bytes differ but the
+extracted text is the same (re-exported PDF, renamed file) the normalized-text
+hash still matches. Either way the stored analysis is reused instead of calling
+the LLM again.
+"""
+import hashlib
+import re
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.metrics import record_cache_lookup
+from app.models.models import ResumeAnalysis
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def hash_text(text: str) -> str:
+    """SHA-256 of the text with case and whitespace normalized"""
+    normalized = _WHITESPACE.sub(" ", text).strip().lower()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _mark_used(db: Session, entry: ResumeAnalysis):
+    entry.hit_count = (entry.hit_count or 0) + 1
+    entry.last_used_at = datetime.utcnow()
+
+
+def lookup_by_content(db: Session, content_hash: str) -> Optional[ResumeAnalysis]:
+    """Cached analysis for byte-identical uploads"""
+    entry = db.query(ResumeAnalysis).filter(ResumeAnalysis.content_hash == content_hash).first()
+    record_cache_lookup("resume_content", entry is not None)
+    if entry:
+        _mark_used(db, entry)
+    return entry
+
+
+def lookup_by_text(db: Session, text_hash: str) -> Optional[ResumeAnalysis]:
+    """Cached analysis for uploads whose extracted text matches"""
+    entry = db.query(ResumeAnalysis).filter(ResumeAnalysis.text_hash == text_hash).first()
+    record_cache_lookup("resume_text", entry is not None)
+    if entry:
+        _mark_used(db, entry)
+    return entry
+
+
+def store(db: Session, content_hash: str, text_hash: str, parsed_text: str, analysis: dict):
+    """Remember the analysis for this content; a concurrent insert of the same hash is fine"""
+    try:
+        with db.begin_nested():
+            db.add(ResumeAnalysis(
+                content_hash=content_hash,
+                text_hash=text_hash,
+                parsed_text=parsed_text,
+                analysis=analysis
+            ))
+    except IntegrityError:
+        pass
@@ -0,0 +1,210 @@
+"""
+Background pipeline for resume analysis.
+
+/resume/upload saves the file, records a ResumeJob row and returns 202 right
+away; worker tasks on the event loop then parse, analyze and store the result.
+The resume_jobs table is the durable queue: jobs left queued or interrupted by
+a restart are picked up again at startup, and each job is claimed with a
+conditional UPDATE so several server processes never run the same job twice.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import List, Optional, Set
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.models import ResumeJob, Resume, User
+from app.services.ai_service import ai_service
+from app.services.resume_parser import parse_resume_async
+from app.services import resume_cache, blob_storage
+
+QUEUED = "queued"
+PROCESSING = "processing"
+COMPLETED = "completed"
+FAILED = "failed"
+
+RESUME_XP = 15
+
+
+class JobError(Exception):
+    """A failure reported back to the user on the job"""
+
+
+_queue: Optional[asyncio.Queue] = None
+_workers: List[asyncio.Task] = []
+_running: Set[int] = set()
+
+
+def enqueue(job_id: int, file_content: Optional[bytes] = None):
+    """Hand a committed job to the workers, with the upload bytes if still in memory"""
+    if _queue is not None:
+        _queue.put_nowait((job_id, file_content))
+
+
+def _claim(db, job_id: int) -> bool:
+    claimed = db.query(ResumeJob).filter(
+        ResumeJob.id == job_id,
+        ResumeJob.status == QUEUED
+    ).update({"status": PROCESSING, "started_at": datetime.utcnow()}, synchronize_session=False)
+    db.commit()
+    return claimed == 1
+
+
+async def analyze_upload(
+    db,
+    filename: str,
+    content_hash: str,
+    file_content: Optional[bytes] = None,
+    file_path: Optional[str] = None
+) -> dict:
+    """
+    Cached analysis for this content, or parse and analyze it.
+    file_content is read from file_path if not given. Raises JobError.
+    """
+    cached = resume_cache.lookup_by_content(db, content_hash)
+    if cached:
+        return cached.analysis
+
+    if file_content is None:
+        # e.g. recovered after a restart, so the upload is no longer in memory
+        file_content = blob_storage.read(file_path)
+
+    try:
+        resume_text = await parse_resume_async(filename, file_content)
+    except TimeoutError:
+        raise JobError("Resume took too long to process. Please upload a simpler file.")
+
+    if not resume_text:
+        raise JobError("Failed to extract text from resume")
+
+    # Same text in different bytes (re-exported or renamed file) reuses the analysis too
+    text_hash = resume_cache.hash_text(resume_text)
+    cached = resume_cache.lookup_by_text(db, text_hash)
+    if cached:
+        analysis, used_ai = cached.analysis, True  # Only AI analyses are cached
+    else:
+        # The LLM call blocks, so keep it off the event loop
+        analysis, used_ai = await asyncio.to_thread(ai_service.analyze_resume, resume_text)
+
+    if used_ai:
+        # Don't pin a local-only analysis (no AI, or the LLM call failed), so it is enriched later
+        resume_cache.store(db, content_hash, text_hash, resume_text, analysis)
+    return analysis
+
+
+async def process_job(job_id: int, file_content: Optional[bytes] = None):
+    """Run one job end to end, recording the outcome on the job row"""
+    db = SessionLocal()
+    try:
+        if not _claim(db, job_id):
+            return  # Already taken by another worker or process
+
+        job = db.query(ResumeJob).filter(ResumeJob.id == job_id).first()
+        try:
+            analysis = await analyze_upload(db, job.filename, job.content_hash, file_content, job.file_path)
+        except JobError as e:
+            job.status = FAILED
+            job.error = str(e)
+            job.finished_at = datetime.utcnow()
+            blob_storage.release(db, job.file_path)  # No resume will take over the upload
+            db.commit()
+            return
+
+        resume = Resume(
+            user_id=job.user_id,
+            filename=job.filename,
+            file_path=job.file_path,
+            content_hash=job.content_hash,
+            analysis_result=analysis,
+            ats_score=analysis.get("ats_score", 75),
+            suggestions=analysis.get("improvements", [])
+        )
+        db.add(resume)
+
+        # Award XP
+        user = db.query(User).filter(User.id == job.user_id).first()
+        user.total_xp += RESUME_XP
+        user.level = (user.total_xp // 1000) + 1
+
+        db.flush()
+        job.resume_id = resume.id
+        job.xp_earned = RESUME_XP
+        job.status = COMPLETED
+        job.finished_at = datetime.utcnow()
+        db.commit()
+    except Exception as e:
+        print(f"Resume job {job_id} error: {e}")
+        db.rollback()
+        db.query(ResumeJob).filter(ResumeJob.id == job_id).update(
+            {"status": FAILED, "error": "Resume analysis failed", "finished_at": datetime.utcnow()},
+            synchronize_session=False
+        )
+        file_path = db.query(ResumeJob.file_path).filter(ResumeJob.id == job_id).scalar()
+        if file_path:
+            blob_storage.release(db, file_path)
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _worker():
+    while True:
+        job_id, file_content = await _queue.get()
+        _running.add(job_id)
+        try:
+            await process_job(job_id, file_content)
+        finally:
+            _running.discard(job_id)
+            _queue.task_done()
+
+
+def _recover_pending_jobs():
+    """Requeue jobs that were waiting, or interrupted mid-run, when the server stopped"""
+    db = SessionLocal()
+    try:
+        # Jobs running longer than the stale timeout belonged to a process that died
+        stale_before = datetime.utcnow() - timedelta(seconds=settings.RESUME_JOB_STALE_SECONDS)
+        db.query(ResumeJob).filter(
+            ResumeJob.status == PROCESSING,
+            ResumeJob.started_at < stale_before
+        ).update({"status": QUEUED}, synchronize_session=False)
+        db.commit()
+        pending = db.query(ResumeJob.id).filter(ResumeJob.status == QUEUED).order_by(ResumeJob.id).all()
+        for row in pending:
+            enqueue(row.id)
+    finally:
+        db.close()
+
+
+async def start_workers():
+    """Start RESUME_JOB_WORKERS worker tasks on the running event loop"""
+    global _queue
+    _queue = asyncio.Queue()
+    for _ in range(settings.RESUME_JOB_WORKERS):
+        _workers.append(asyncio.create_task(_worker()))
+    _recover_pending_jobs()
+
+
+async def stop_workers(timeout: float = 30.0):
+    """Let queued and in-flight jobs finish (up to timeout), then stop the workers"""
+    if _queue is None:
+        return
+    try:
+        await asyncio.wait_for(_queue.join(), timeout=timeout)
+    except asyncio.TimeoutError:
+        print(f"Stopping with {len(_running)} resume job(s) still running; they will resume on restart")
+    interrupted = list(_running)
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+
+    if interrupted:
+        db = SessionLocal()
+        try:
+            db.query(ResumeJob).filter(
+                ResumeJob.id.in_(interrupted),
+                ResumeJob.status == PROCESSING
+            ).update({"status": QUEUED}, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
@@ -1,19 +1,50 @@
 """
 Resume parser to extract text from PDF and DOCX files
 """
-import PyPDF2
-from docx import Document
 import io
+import os
+import time
+import signal
+import asyncio
+import itertools
+import threading
+import multiprocessing
+from multiprocessing.pool import Pool
+from typing import Dict, Iterator, Optional
+from app.core.config import settings
 
 
-def extract_text_from_pdf(file_content: bytes) -> str:
-    """Extract text from PDF file"""
+def iter_pdf_pages(file_content: bytes, max_pages: Optional[int] = None) -> Iterator[str]:
+    """Yield the text of each PDF page lazily, so callers can stop early"""
+    import PyPDF2  # Imported on first use to keep server start-up fast
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+    pages = pdf_reader.pages if max_pages is None else pdf_reader.pages[:max_pages]
+    for page in pages:
+        yield page.extract_text() or ""
+
+
+def extract_text_from_pdf(
+    file_content: bytes,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None
+) -> str:
+    """
+    Extract text from PDF file.
+    Stops after max_pages pages or once max_chars characters have been read
+    (defaults: PARSER_MAX_PAGES / PARSER_MAX_CHARS) and joins the pages once.
+    """
+    max_pages = settings.PARSER_MAX_PAGES if max_pages is None else max_pages
+    max_chars = settings.PARSER_MAX_CHARS if max_chars is None else max_chars
     try:
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text.strip()
+        pages = []
+        total_chars = 0
+        for page_text in iter_pdf_pages(file_content, max_pages or None):
+            pages.append(page_text)
+            total_chars += len(page_text) + 1
+            if max_chars and total_chars >= max_chars:
+                break
+        text = "\n".join(pages)
+        return (text[:max_chars] if max_chars else text).strip()
     except Exception as e:
         print(f"PDF parsing error: {e}")
         return ""
@@ -21,6 +52,7 @@ def extract_text_from_pdf(file_content: bytes) -> str:
 
 def extract_text_from_docx(file_content: bytes) -> str:
     """Extract text from DOCX file"""
+    from docx import Document  # Imported on first use, like PyPDF2
     try:
         doc = Document(io.BytesIO(file_content))
         text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
@@ -38,3 +70,128 @@ def parse_resume(filename: str, file_content: bytes) -> str:
         return extract_text_from_docx(file_content)
     else:
         raise ValueError("Unsupported file format. Please upload PDF or DOCX files.")
+
+
+# Parsing is CPU-bound pure Python, so it runs in a pool of worker processes
+# to keep the event loop free and use every core. multiprocessing.Pool (unlike
+# ProcessPoolExecutor) replaces a worker that dies without failing the jobs
+# running in the others, so a stuck parse is stopped by killing just its worker.
+_pool: Optional[Pool] = None
+_pool_lock = threading.Lock()
+_started: Optional[multiprocessing.SimpleQueue] = None  # (job id, worker pid) as each job starts
+_job_pids: Dict[int, int] = {}
+_job_ids = itertools.count()
+
+# How long a timed-out job's start notice may lag behind the job itself
+START_NOTICE_GRACE = 0.5
+
+
+def _init_parser_worker(started: multiprocessing.SimpleQueue):
+    """Cap worker memory so a pathological document fails instead of exhausting the host"""
+    global _started
+    _started = started
+    try:
+        import resource
+    except ImportError:
+        return  # Not available on Windows
+    limit = settings.PARSER_MAX_MEMORY_MB * 1024 * 1024
+    if limit > 0:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _parse_job(job_id: int, deadline: float, filename: str, file_content: bytes) -> Optional[str]:
+    """Runs in a worker: announce which process has the job, then parse"""
+    if time.time() > deadline:
+        return None  # Timed out while queued; the caller has already given up
+    _started.put((job_id, os.getpid()))
+    return parse_resume(filename, file_content)
+
+
+def _get_pool() -> Pool:
+    global _pool, _started
+    with _pool_lock:
+        if _pool is None:
+            workers = settings.PARSER_WORKERS or min(4, os.cpu_count() or 1)
+            _started = multiprocessing.SimpleQueue()
+            _pool = Pool(processes=workers, initializer=_init_parser_worker, initargs=(_started,))
+        return _pool
+
+
+def _collect_started():
+    """Record the worker pid of every job that has started since the last call"""
+    with _pool_lock:
+        while _started is not None and not _started.empty():
+            job_id, pid = _started.get()
+            _job_pids[job_id] = pid
+
+
+def _kill_job(job_id: int):
+    """Kill the worker running job_id; the pool starts a replacement and other jobs carry on"""
+    give_up_at = time.monotonic() + START_NOTICE_GRACE
+    while True:
+        _collect_started()
+        pid = _job_pids.pop(job_id, None)
+        if pid is not None or time.monotonic() >= give_up_at:
+            break
+        time.sleep(0.05)
+    if pid is None:
+        return  # Never started; the worker skips it once its deadline has passed
+    try:
+        os.kill(pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+    except (ProcessLookupError, PermissionError):
+        pass  # Already gone
+
+
+def shutdown_pool(timeout: Optional[float] = None):
+    """Stop the pool, waiting up to timeout (default PARSER_TIMEOUT) for running parses"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        # Let running jobs finish, but don't wait on a stuck one past its timeout
+        pool.close()
+        joiner = threading.Thread(target=pool.join, daemon=True)
+        joiner.start()
+        joiner.join(settings.PARSER_TIMEOUT if timeout is None else timeout)
+        if joiner.is_alive():
+            pool.terminate()
+
+
+async def parse_resume_async(filename: str, file_content: bytes) -> str:
+    """
+    Parse a resume in the worker pool without blocking the event loop.
+    Raises TimeoutError if parsing takes longer than PARSER_TIMEOUT seconds.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def resolve(setter, value):
+        if not future.done():
+            setter(value)
+
+    def deliver(setter, value):
+        # Runs on the pool's result thread, which must not raise
+        try:
+            loop.call_soon_threadsafe(resolve, setter, value)
+        except RuntimeError:
+            pass  # Event loop already closed
+
+    def on_result(text):
+        deliver(future.set_result, text)
+
+    def on_error(error):
+        deliver(future.set_exception, error)
+
+    job_id = next(_job_ids)
+    deadline = time.time() + settings.PARSER_TIMEOUT
+    _get_pool().apply_async(
+        _parse_job, (job_id, deadline, filename, file_content), callback=on_result, error_callback=on_error
+    )
+    try:
+        return await asyncio.wait_for(future, timeout=settings.PARSER_TIMEOUT)
+    except asyncio.TimeoutError:
+        await asyncio.to_thread(_kill_job, job_id)
+        raise TimeoutError(f"Parsing {filename} exceeded {settings.PARSER_TIMEOUT}s")
+    finally:
+        _collect_started()
+        _job_pids.pop(job_id, None)
@@ -0,0 +1,342 @@
+"""
+In-memory search index over courses, lessons and FAQs.
+
+Text is tokenized, stop words dropped and terms stemmed into an inverted
+index scored with BM25 (titles and questions weigh more than bodies). Query
+terms that are not in the vocabulary are matched to terms within a small edit
+distance (candidates come from a trigram index), so typos still find results,
+and the last query term also matches as a prefix for search-as-you-type.
+
+The index is built from the database on first use. Changes committed through
+the ORM in this process are applied incrementally; other workers rebuild when
+they see the catalog version change.
+"""
+import bisect
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.models.models import Course, Lesson, FAQ
+from app.services import catalog_cache
+
+TITLE_WEIGHT = 3.0
+BODY_WEIGHT = 1.0
+BM25_K1 = 1.2
+BM25_B = 0.75
+TYPO_SHORT_TERM = 5  # Terms up to this long may have one typo, longer ones two
+TYPO_MAX_EXPANSIONS = 3
+TYPO_PENALTY = 0.7
+PREFIX_MAX_EXPANSIONS = 10
+SNIPPET_CHARS = 160
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:[+#]+|\.js)?")
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "do", "does", "for", "from", "how", "i", "if", "in",
+    "is", "it", "my", "of", "on", "or", "that", "the", "this", "to", "was", "what", "when", "where",
+    "which", "with", "you", "your",
+}
+
+
+def stem(word: str) -> str:
+    """Light suffix-stripping stemmer: plurals, -ing/-ed/-ly/-ment/-ness and a final e"""
+    if len(word) <= 3 or not word.isalpha():
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        word = word[:-3] + "y"
+    elif word.endswith("sses"):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        word = word[:-1]
+    for suffix in ("ingly", "edly", "ing", "ed", "ly", "ment", "ness"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "lsz":
+                word = word[:-1]  # running -> run
+            break
+    if word.endswith("e") and len(word) > 3:
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    return [stem(token) for token in _TOKEN.findall((text or "").lower()) if token not in STOP_WORDS]
+
+
+def trigrams(term: str) -> Set[str]:
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Damerau-Levenshtein distance (optimal string alignment: insertions,
+    deletions, substitutions and adjacent transpositions), or limit + 1 once
+    it is known to exceed limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = None
+    row = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous, row = previous, row, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            row[j] = min(previous[j] + 1, row[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                row[j] = min(row[j], before[j - 2] + 1)
+        if min(row) > limit:
+            return limit + 1
+    return min(row[-1], limit + 1)
+
+
+def _prefixes(raw: str) -> Set[str]:
+    """
+    Prefixes to look up for a partly typed last word: as typed, stemmed, and
+    with a half-typed suffix completed (programmi -> programming -> program).
+    """
+    prefixes = {raw, stem(raw)}
+    for suffix in ("ing", "ment", "ness"):
+        for cut in range(1, len(suffix)):
+            if raw.endswith(suffix[:cut]):
+                prefixes.add(stem(raw + suffix[cut:]))
+    return {prefix for prefix in prefixes if len(prefix) >= 2}
+
+
+def _document(obj) -> Optional[Tuple[str, dict]]:
+    """(key, document) for an indexed model instance"""
+    if isinstance(obj, Course):
+        return f"course:{obj.id}", {
+            "type": "course", "id": obj.id, "title": obj.title,
+            "body": " ".join(filter(None, [obj.description, obj.category])),
+            "category": obj.category,
+        }
+    if isinstance(obj, Lesson):
+        return f"lesson:{obj.id}", {
+            "type": "lesson", "id": obj.id, "title": obj.title, "body": obj.content or "",
+            "course_id": obj.course_id,
+        }
+    if isinstance(obj, FAQ):
+        return f"faq:{obj.id}", {
+            "type": "faq", "id": obj.id, "title": obj.question, "body": obj.answer or "",
+            "category": obj.category,
+        }
+    return None
+
+
+class SearchIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.version: Optional[int] = None
+        self._clear()
+
+    def _clear(self):
+        self.postings: Dict[str, Dict[str, float]] = defaultdict(dict)  # term -> {key: weighted tf}
+        self.doc_terms: Dict[str, Dict[str, float]] = {}
+        self.doc_lengths: Dict[str, float] = {}
+        self.docs: Dict[str, dict] = {}
+        self.total_length = 0.0
+        self.grams: Dict[str, Set[str]] = defaultdict(set)  # trigram -> terms
+        self.vocabulary: List[str] = []  # sorted, for prefix lookups
+
+    @property
+    def built(self) -> bool:
+        return self.version is not None
+
+    def _add_term(self, term: str):
+        bisect.insort(self.vocabulary, term)
+        for gram in trigrams(term):
+            self.grams[gram].add(term)
+
+    def _drop_term(self, term: str):
+        del self.postings[term]
+        i = bisect.bisect_left(self.vocabulary, term)
+        if i < len(self.vocabulary) and self.vocabulary[i] == term:
+            self.vocabulary.pop(i)
+        for gram in trigrams(term):
+            self.grams[gram].discard(term)
+            if not self.grams[gram]:
+                del self.grams[gram]
+
+    def remove(self, key: str):
+        with self._lock:
+            terms = self.doc_terms.pop(key, None)
+            if terms is None:
+                return
+            for term in terms:
+                self.postings[term].pop(key, None)
+                if not self.postings[term]:
+                    self._drop_term(term)
+            self.total_length -= self.doc_lengths.pop(key)
+            del self.docs[key]
+
+    def upsert(self, key: str, doc: dict):
+        weights = Counter()
+        for term in tokenize(doc["title"]):
+            weights[term] += TITLE_WEIGHT
+        for term in tokenize(doc["body"]):
+            weights[term] += BODY_WEIGHT
+
+        with self._lock:
+            self.remove(key)
+            for term, weight in weights.items():
+                if term not in self.postings:
+                    self._add_term(term)
+                self.postings[term][key] = weight
+            self.doc_terms[key] = dict(weights)
+            self.doc_lengths[key] = sum(weights.values())
+            self.total_length += self.doc_lengths[key]
+            self.docs[key] = doc
+
+    def rebuild(self, db: Session, version: int):
+        documents = [
+            _document(obj)
+            for model in (Course, Lesson, FAQ)
+            for obj in db.query(model).all()
+        ]
+        with self._lock:
+            self._clear()
+            for key, doc in documents:
+                self.upsert(key, doc)
+            self.version = version
+
+    def _similar_terms(self, term: str) -> List[Tuple[str, int]]:
+        """Vocabulary terms within typo distance of term, with their edit distance"""
+        limit = 1 if len(term) <= TYPO_SHORT_TERM else 2
+        # Any shared trigram makes a candidate: one typo can break up to three of them
+        shared = Counter()
+        for gram in trigrams(term):
+            for candidate in self.grams.get(gram, ()):
+                shared[candidate] += 1
+        scored = []
+        for candidate, count in shared.items():
+            distance = edit_distance(term, candidate, limit)
+            if distance <= limit:
+                scored.append((candidate, distance, count))
+        scored.sort(key=lambda item: (item[1], -item[2]))
+        return [(candidate, distance) for candidate, distance, _ in scored[:TYPO_MAX_EXPANSIONS]]
+
+    def _prefixed_terms(self, prefix: str) -> List[str]:
+        i = bisect.bisect_left(self.vocabulary, prefix)
+        matches = []
+        while i < len(self.vocabulary) and self.vocabulary[i].startswith(prefix):
+            matches.append(self.vocabulary[i])
+            if len(matches) >= PREFIX_MAX_EXPANSIONS:
+                break
+            i += 1
+        return matches
+
+    def _expand(self, query: str) -> List[Dict[str, float]]:
+        """For each query term, the index terms it matches and how much they count"""
+        raw_terms = [t for t in _TOKEN.findall(query.lower()) if t not in STOP_WORDS]
+        expanded = []
+        for i, raw in enumerate(raw_terms):
+            term = stem(raw)
+            matches: Dict[str, float] = {}
+            if term in self.postings:
+                matches[term] = 1.0
+            if i == len(raw_terms) - 1 and len(raw) >= 2:
+                for prefix in _prefixes(raw):
+                    for candidate in self._prefixed_terms(prefix):
+                        matches.setdefault(candidate, 0.9)
+            if not matches:
+                for candidate, distance in self._similar_terms(term):
+                    matches[candidate] = TYPO_PENALTY ** distance
+            expanded.append(matches)
+        return expanded
+
+    def search(self, query: str, limit: int = 20, types: Optional[Iterable[str]] = None) -> List[dict]:
+        with self._lock:
+            doc_count = len(self.docs)
+            if not doc_count:
+                return []
+            average_length = self.total_length / doc_count
+            scores: Dict[str, float] = defaultdict(float)
+            matched_terms: Dict[str, int] = defaultdict(int)
+
+            for matches in self._expand(query):
+                hit_in_group: Set[str] = set()
+                for term, boost in matches.items():
+                    postings = self.postings[term]
+                    idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for key, tf in postings.items():
+                        norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[key] / average_length)
+                        scores[key] += boost * idf * tf * (BM25_K1 + 1) / (tf + norm)
+                        hit_in_group.add(key)
+                for key in hit_in_group:
+                    matched_terms[key] += 1
+
+            # Documents matching more of the query terms rank first
+            wanted = set(types) if types else None
+            ranked = sorted(
+                (key for key in scores if wanted is None or self.docs[key]["type"] in wanted),
+                key=lambda key: (-matched_terms[key], -scores[key])
+            )[:limit]
+            return [self._hit(key, scores[key], query) for key in ranked]
+
+    def _hit(self, key: str, score: float, query: str) -> dict:
+        doc = self.docs[key]
+        hit = {"type": doc["type"], "id": doc["id"], "title": doc["title"], "score": round(score, 3)}
+        for field in ("course_id", "category"):
+            if field in doc:
+                hit[field] = doc[field]
+        hit["snippet"] = _snippet(doc["body"], query)
+        return hit
+
+
+def _snippet(body: str, query: str) -> str:
+    """A window of the body around the first query term it contains"""
+    text = " ".join(body.split())
+    lowered = text.lower()
+    positions = [lowered.find(t) for t in _TOKEN.findall(query.lower()) if t not in STOP_WORDS]
+    positions = [p for p in positions if p >= 0]
+    start = max(0, min(positions) - SNIPPET_CHARS // 4) if positions else 0
+    snippet = text[start:start + SNIPPET_CHARS]
+    return ("…" if start else "") + snippet + ("…" if start + SNIPPET_CHARS < len(text) else "")
+
+
+index = SearchIndex()
+_build_lock = threading.Lock()
+
+
+def search(db: Session, query: str, limit: int = 20, types: Optional[Iterable[str]] = None) -> List[dict]:
+    """Ranked hits, building or refreshing the index if the catalog version changed"""
+    version = catalog_cache.current_version(db)
+    if index.version != version:
+        with _build_lock:
+            if index.version != version:
+                index.rebuild(db, version)
+    return index.search(query, limit, types)
+
+
+# Incremental updates from ORM writes in this process
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session, flush_context):
+    if not index.built:
+        return
+    changes = session.info.setdefault("search_index_changes", [])
+    for obj in list(session.new) + list(session.dirty):
+        document = _document(obj)
+        if document:
+            changes.append(("upsert",) + document)
+    for obj in session.deleted:
+        document = _document(obj)
+        if document:
+            changes.append(("remove", document[0], None))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session):
+    for action, key, doc in session.info.pop("search_index_changes", []):
+        if action == "upsert":
+            index.upsert(key, doc)
+        else:
+            index.remove(key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session):
+    session.info.pop("search_index_changes", None)
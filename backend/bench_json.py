@@ -0,0 +1,156 @@
+"""
+Microbenchmark for JSON response serialization on the largest responses:
+interview history, interview feedback, the leaderboard, the course catalog
+and a full resume analysis. Compares FastAPI's default path (jsonable_encoder
+then stdlib json, with .isoformat() strings) against ORJSONResponse (orjson,
+datetimes serialized natively).
+Run this with: python bench_json.py
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.responses import ORJSONResponse
+
+REPEATS = 200
+NOW = datetime(2024, 5, 1, 12, 30, 15, 123456)
+
+
+def interview_history(count: int = 200, iso: bool = False) -> dict:
+    return {"interviews": [
+        {
+            "id": i,
+            "role": "Backend Engineer",
+            "difficulty": "Medium",
+            "overall_score": 72.5 + i % 20,
+            "total_questions": 5,
+            "created_at": (NOW - timedelta(days=i)).isoformat() if iso else NOW - timedelta(days=i)
+        }
+        for i in range(count)
+    ]}
+
+
+def interview_feedback(answers: int = 20, iso: bool = False) -> dict:
+    evaluation = {
+        "score": 7,
+        "strengths": ["Clear structure", "Good use of examples", "Mentions trade-offs"],
+        "improvements": ["Quantify impact", "Discuss failure modes"],
+        "feedback": "Solid answer that covers the main points. " * 8,
+        "sample_answer": "A strong answer would start with the requirements and then... " * 6
+    }
+    return {
+        "interview_id": 1,
+        "role": "Backend Engineer",
+        "difficulty": "Medium",
+        "overall_score": 7.2,
+        "questions": [{"id": i, "question": f"Question {i}: describe a system you designed. " * 3} for i in range(answers)],
+        "responses": [
+            {
+                "question_id": i,
+                "question": f"Question {i}",
+                "response": "I designed a service that handles millions of requests per day. " * 10,
+                "timestamp": (NOW + timedelta(minutes=i)).isoformat() if iso else NOW + timedelta(minutes=i)
+            }
+            for i in range(answers)
+        ],
+        "feedback": [{"question_id": i, "score": 7, "evaluation": evaluation} for i in range(answers)]
+    }
+
+
+def leaderboard(count: int = 100, **_) -> dict:
+    return {"leaderboard": [
+        {"rank": i + 1, "name": f"User {i}", "level": 10 - i // 10, "xp": 10000 - i * 37, "streak": i % 30}
+        for i in range(count)
+    ]}
+
+
+def courses(count: int = 50, **_) -> list:
+    return [
+        {
+            "id": i,
+            "title": f"Course {i}: Data Structures & Algorithms Masterclass",
+            "description": "Master fundamental data structures and algorithms essential for coding interviews",
+            "category": "Programming",
+            "difficulty": "Intermediate",
+            "total_lessons": 15,
+            "duration_hours": 25,
+            "xp_reward": 250,
+            "thumbnail": "/courses/dsa.jpg"
+        }
+        for i in range(count)
+    ]
+
+
+def resume_analysis(iso: bool = False) -> dict:
+    return {
+        "id": 1,
+        "filename": "resume.pdf",
+        "ats_score": 78,
+        "analysis": {
+            "ats_score": 78,
+            "strengths": [f"Strength {i}: led migration to microservices" for i in range(10)],
+            "weaknesses": [f"Weakness {i}: missing metrics" for i in range(10)],
+            "missing_keywords": ["kubernetes", "terraform", "graphql", "kafka", "redis"] * 4,
+            "section_scores": {section: 70 + i for i, section in enumerate(
+                ["contact", "summary", "experience", "education", "skills", "projects"]
+            )},
+            "keyword_matches": {f"keyword{i}": i % 4 for i in range(60)},
+            "overall_feedback": "The resume is well structured but would benefit from quantified results. " * 10
+        },
+        "suggestions": [f"Suggestion {i}: rewrite bullet points to lead with action verbs" for i in range(15)],
+        "created_at": NOW.isoformat() if iso else NOW
+    }
+
+
+PAYLOADS = [
+    ("interview history (200)", interview_history),
+    ("interview feedback (20)", interview_feedback),
+    ("leaderboard (100)", leaderboard),
+    ("course catalog (50)", courses),
+    ("resume analysis", resume_analysis),
+]
+
+
+def stdlib_render(content) -> bytes:
+    """FastAPI's default: jsonable_encoder, then JSONResponse's json.dumps"""
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def orjson_render(content) -> bytes:
+    return ORJSONResponse(content).body
+
+
+def best_of(fn, *args) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1_000_000
+
+
+def main():
+    print("=" * 76)
+    print(f"{'response':<26} {'bytes':>8} {'stdlib (us)':>13} {'orjson (us)':>13} {'speedup':>9}")
+    print("=" * 76)
+
+    for name, build in PAYLOADS:
+        before = build(iso=True)  # endpoints used to call .isoformat() themselves
+        after = build()
+        size = len(orjson_render(after))
+        stdlib = best_of(stdlib_render, before)
+        fast = best_of(orjson_render, after)
+        print(f"{name:<26} {size:>8} {stdlib:>13.1f} {fast:>13.1f} {stdlib / fast:>8.1f}x")
+
+    print("=" * 76)
+    print(f"best of {REPEATS} runs per payload")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Cold-start budget check. Imports the app in fresh interpreters with
+`python -X importtime` and fails if the best time is over budget or if a
+heavy dependency that should load lazily is imported at start-up.
+Run this with: python check_import_time.py [--budget-ms 1200] [--runs 5]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Loaded on first use only; importing any of them at start-up is a regression
+LAZY_MODULES = ["google.generativeai", "PyPDF2", "docx", "reportlab"]
+
+
+def measure() -> dict:
+    """Cumulative import time in microseconds for every module imported by `import app.main`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        sys.exit(f"❌ Importing app.main failed:\n{result.stderr}")
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        cumulative = cumulative.strip()
+        if cumulative.isdigit():
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=1200, help="maximum import time of app.main")
+    parser.add_argument("--runs", type=int, default=5, help="imports to measure; the fastest counts")
+    parser.add_argument("--top", type=int, default=10, help="slowest top-level imports to list")
+    args = parser.parse_args()
+
+    runs = [measure() for _ in range(args.runs)]
+    best = min(runs, key=lambda modules: modules["app.main"])
+    total_ms = best["app.main"] / 1000
+
+    print(f"app.main import: {total_ms:.0f} ms (best of {args.runs}, budget {args.budget_ms:.0f} ms)")
+    slowest = sorted(
+        ((name, us) for name, us in best.items() if name != "app.main" and "." not in name),
+        key=lambda item: -item[1]
+    )[:args.top]
+    for name, us in slowest:
+        print(f"   {us / 1000:8.1f} ms  {name}")
+
+    failed = False
+    eager = [name for name in LAZY_MODULES if name in best]
+    if eager:
+        print(f"❌ Imported at start-up but should load lazily: {', '.join(eager)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"❌ Cold start over budget by {total_ms - args.budget_ms:.0f} ms")
+        failed = True
+
+    if failed:
+        sys.exit(1)
+    print("🎉 Cold start within budget")
+
+
+if __name__ == "__main__":
+    main()
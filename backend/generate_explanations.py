@@ -0,0 +1,53 @@
+"""
+Pre-generate AI explanations for every lesson, so /courses/{id}/lessons/{id}/explain
+is served from storage instead of calling the LLM on each click.
+Lessons whose stored explanation is still current are skipped, so this is safe
+to re-run after content changes.
+Run this with: python generate_explanations.py [--concurrency 4] [--course-id ID] [--force]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import engine, Base, add_missing_columns
+from app.services import lesson_explanations
+
+# Create all tables
+Base.metadata.create_all(bind=engine)
+add_missing_columns(engine)
+
+
+def print_progress(done: int, total: int, lesson_title: str, outcome: str):
+    print(f"[{done}/{total}] {outcome:<10} {lesson_title}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate lesson explanations")
+    parser.add_argument("--concurrency", "-c", type=int, default=4, help="LLM calls in flight (default 4)")
+    parser.add_argument("--course-id", type=int, help="Only this course's lessons")
+    parser.add_argument("--force", action="store_true", help="Regenerate even if the stored explanation is current")
+    args = parser.parse_args()
+
+    print("💡 Generating lesson explanations...")
+    try:
+        counts = asyncio.run(lesson_explanations.pregenerate(
+            concurrency=args.concurrency,
+            force=args.force,
+            course_id=args.course_id,
+            progress=print_progress
+        ))
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(f"\n🎉 Done: {counts['lessons']} lessons")
+    print(f"  - {counts['up_to_date']} already up to date")
+    print(f"  - {counts['generated']} generated")
+    print(f"  - {counts['failed']} failed")
+
+
+if __name__ == "__main__":
+    main()
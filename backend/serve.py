@@ -0,0 +1,163 @@
+"""
+Production server for the backend (start.py is the auto-reloading dev server).
+
+Runs gunicorn with uvicorn workers: one worker per CPU core by default, the app
+preloaded in the master so workers share its memory copy-on-write, and
+keep-alive/backlog from settings. Database setup, catalog seeding and lesson
+rendering happen once here before the workers fork, instead of racing in
+every worker (DB_SETUP_ON_STARTUP is turned off for the workers).
+
+On SIGTERM each worker stops accepting connections, finishes in-flight requests,
+then drains background resume jobs (RESUME_JOB_DRAIN_TIMEOUT) before exiting;
+gunicorn kills workers still running after SERVER_GRACEFUL_TIMEOUT. Requests get
+what is left of that after the job drain and SHUTDOWN_HEADROOM for the remaining
+shutdown hooks; the server refuses to start if nothing is left. Jobs cut off by
+the deadline are requeued on the next start.
+
+Without gunicorn (e.g. on Windows) it falls back to uvicorn's own process
+manager, which has no preloading: every worker imports the app itself.
+
+Run this with: python serve.py [--workers 4] [--port 8000]
+"""
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.config import settings
+
+try:
+    from gunicorn.app.base import BaseApplication
+    from uvicorn.workers import UvicornWorker
+except ImportError:
+    BaseApplication = None
+
+SHUTDOWN_HEADROOM = 5  # seconds kept for shutdown hooks after both drains (snapshots, requeueing, parser pool)
+
+
+def available_cpus() -> int:
+    """CPU cores this process may run on (respects container/cpuset limits where the OS reports them)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def request_drain_timeout() -> int:
+    """Time for in-flight requests: the graceful timeout minus the job drain and the headroom"""
+    return int(settings.SERVER_GRACEFUL_TIMEOUT - settings.RESUME_JOB_DRAIN_TIMEOUT - SHUTDOWN_HEADROOM)
+
+
+def share_parser_cores(workers: int):
+    """Split the automatic parser pool size across server workers so they don't oversubscribe the CPU"""
+    if settings.PARSER_WORKERS == 0 and workers > 1:
+        per_worker = max(1, min(4, available_cpus() // workers))
+        settings.PARSER_WORKERS = per_worker
+        os.environ["PARSER_WORKERS"] = str(per_worker)  # For workers that import the app afresh
+
+
+def prepare():
+    """One-time start-up work, done before any worker exists"""
+    from app.core.database import engine
+    from app.main import init_database, seed_catalog, render_lessons
+
+    init_database()
+    seed_catalog()
+    render_lessons()
+    # Already done, so workers skip it (forked workers share settings; spawned ones read the environment)
+    settings.DB_SETUP_ON_STARTUP = False
+    os.environ["DB_SETUP_ON_STARTUP"] = "false"
+    # Workers must not share the master's database connections
+    engine.dispose()
+
+
+if BaseApplication is not None:
+    class ServerWorker(UvicornWorker):
+        CONFIG_KWARGS = {
+            "loop": "auto",
+            "http": "auto",
+            "timeout_graceful_shutdown": request_drain_timeout(),
+        }
+
+    class GunicornServer(BaseApplication):
+        def __init__(self, options: dict):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app.main import app
+            return app
+
+
+def post_fork(server, worker):
+    # A preloaded engine may hold pooled connections from the master; start this worker with its own
+    from app.core.database import engine
+    engine.dispose(close=False)
+
+
+def run_gunicorn(args):
+    GunicornServer({
+        "bind": f"{args.host}:{args.port}",
+        "workers": args.workers,
+        "worker_class": "serve.ServerWorker",  # gunicorn wants an import path
+        "preload_app": not args.no_preload,
+        "keepalive": settings.SERVER_KEEPALIVE,
+        "backlog": settings.SERVER_BACKLOG,
+        "graceful_timeout": settings.SERVER_GRACEFUL_TIMEOUT,
+        "post_fork": post_fork,
+        "accesslog": "-",
+    }).run()
+
+
+def run_uvicorn(args):
+    import uvicorn
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE,
+        timeout_graceful_shutdown=request_drain_timeout(),
+        log_level="info",
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=settings.SERVER_WORKERS or available_cpus(),
+                        help="server processes (default: SERVER_WORKERS, or one per CPU core)")
+    parser.add_argument("--no-preload", action="store_true", help="import the app in each worker instead of once")
+    parser.add_argument("--server", choices=["auto", "gunicorn", "uvicorn"], default="auto")
+    args = parser.parse_args()
+
+    use_gunicorn = args.server == "gunicorn" or (args.server == "auto" and BaseApplication is not None)
+    if use_gunicorn and BaseApplication is None:
+        sys.exit("❌ gunicorn is not installed (pip install gunicorn), or use --server uvicorn")
+
+    if request_drain_timeout() < 1:
+        sys.exit(f"❌ SERVER_GRACEFUL_TIMEOUT ({settings.SERVER_GRACEFUL_TIMEOUT}s) must be more than "
+                 f"RESUME_JOB_DRAIN_TIMEOUT ({settings.RESUME_JOB_DRAIN_TIMEOUT:g}s) + {SHUTDOWN_HEADROOM}s")
+
+    share_parser_cores(args.workers)
+    if args.workers > 1 and not settings.METRICS_DIR:
+        print("⚠️  METRICS_DIR is not set, so /metrics only reports the worker that answers it")
+
+    print(f"🚀 Starting {args.workers} worker(s) with {'gunicorn' if use_gunicorn else 'uvicorn'} "
+          f"on http://{args.host}:{args.port}")
+    prepare()
+    if use_gunicorn:
+        run_gunicorn(args)
+    else:
+        run_uvicorn(args)
+
+
+if __name__ == "__main__":
+    main()
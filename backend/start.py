@@ -1,5 +1,6 @@
 """
-Simple startup script for the backend server
+Simple startup script for the backend server (development, auto-reload).
+For production use serve.py, which runs multiple workers.
 Run this with: python start.py
 """
 import uvicorn
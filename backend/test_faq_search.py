@@ -0,0 +1,151 @@
+"""
+FAQ Search Tests
+Checks the FAQ full-text search on a temporary SQLite database: the FTS5
+index and its sync triggers, BM25 ranking with questions weighted above
+answers, <mark> highlighting, and the LIKE fallback.
+Run this with: python -m pytest test_faq_search.py
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Settings are read once on first import; keep any later test module in this run off the real database
+_tmp_dir = tempfile.mkdtemp(prefix="faq_search_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'test.db')}"
+os.environ["UPLOAD_DIR"] = os.path.join(_tmp_dir, "uploads")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from app.models.models import FAQ
+from app.services import faq_search
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    """A database with just the faqs table; install() picks the search backend for it"""
+    monkeypatch.setattr(faq_search, "_backend", faq_search._backend)  # Restored after the test
+    engine = create_engine(f"sqlite:///{tmp_path / 'faqs.db'}")
+    FAQ.__table__.create(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    faq_search.install(engine)
+    db = sessionmaker(bind=engine)()
+    yield db
+    db.close()
+
+
+def add_faq(db, question, answer, order=0):
+    faq = FAQ(category="General", question=question, answer=answer, order=order)
+    db.add(faq)
+    db.commit()
+    return faq
+
+
+def questions(results):
+    return [result["question"] for result in results]
+
+
+def test_install_creates_the_index_and_triggers(engine):
+    faq_search.install(engine)
+    assert faq_search._backend == "fts5"
+    assert "faqs_fts" in inspect(engine).get_table_names()
+    with engine.connect() as conn:
+        triggers = conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'trigger'")).scalars().all()
+    assert set(triggers) == {"faqs_fts_insert", "faqs_fts_update", "faqs_fts_delete"}
+    faq_search.install(engine)  # Already installed: a no-op
+
+
+def test_rows_added_before_install_are_indexed(engine):
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO faqs (question, answer) VALUES ('What is a heap?', 'A tree-based structure')"))
+    faq_search.install(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        assert questions(faq_search.search(db, "heap")) == ["What is a heap?"]
+    finally:
+        db.close()
+
+
+def test_insert_is_searchable_with_highlights(db):
+    add_faq(db, "How long is a mock interview?", "Each mock interview takes about 30 minutes of practice.")
+    [result] = faq_search.search(db, "interview")
+    assert result["question_highlight"] == "How long is a mock <mark>interview</mark>?"
+    assert "<mark>interview</mark> takes" in result["snippet"]
+
+
+def test_update_changes_ranking_and_snippets(db):
+    python = add_faq(db, "Is Python covered?", "Yes, there is a full course on the language.")
+    java = add_faq(db, "Is Java covered?", "Java is on the roadmap for next year.")
+    assert questions(faq_search.search(db, "python")) == ["Is Python covered?"]
+
+    java.question = "Which Python topics are covered?"
+    java.answer = "Python decorators, generators and typing."
+    python.question = "Which languages are covered?"
+    python.answer = "Mostly Python, with some SQL."
+    db.commit()
+
+    results = faq_search.search(db, "python")
+    assert questions(results) == ["Which Python topics are covered?", "Which languages are covered?"]
+    assert results[0]["snippet"] == "<mark>Python</mark> decorators, generators and typing."
+    assert results[1]["question_highlight"] == "Which languages are covered?"
+    assert faq_search.search(db, "java") == []
+
+
+def test_delete_removes_from_the_index(db):
+    faq = add_faq(db, "Can I reset my progress?", "Yes, from the settings page.")
+    db.delete(faq)
+    db.commit()
+    assert faq_search.search(db, "reset") == []
+
+
+def test_question_matches_outrank_answer_matches(db):
+    add_faq(db, "Do you offer certificates?", "Recursion, recursion and recursion: every course covers it.")
+    add_faq(db, "What is recursion?", "A function calling itself.")
+    assert questions(faq_search.search(db, "recursion")) == ["What is recursion?", "Do you offer certificates?"]
+
+
+@pytest.mark.parametrize("query", ["interviews", "interviewing", "interv", "INTERVIEW"])
+def test_stemming_prefixes_and_case(db, query):
+    add_faq(db, "How do I prepare for an interview?", "Practice every day.")
+    assert questions(faq_search.search(db, query)) == ["How do I prepare for an interview?"]
+
+
+@pytest.mark.parametrize("query", ['"', 'python" OR answer:*', "NEAR(a b)", "-", "   "])
+def test_query_syntax_is_not_injected(db, query):
+    add_faq(db, "Is Python covered?", "Yes.")
+    assert isinstance(faq_search.search(db, query), list)
+
+
+def test_falls_back_to_like_when_the_index_cannot_be_created(engine):
+    with engine.begin() as conn:
+        # A clashing trigger makes the setup fail, as a SQLite without FTS5 would
+        conn.execute(text("CREATE TRIGGER faqs_fts_insert AFTER INSERT ON faqs BEGIN SELECT 1; END"))
+    faq_search.install(engine)
+    assert faq_search._backend == "like"
+    assert "faqs_fts" not in inspect(engine).get_table_names()
+
+    faq_search.install(engine)  # The partial setup was removed, so a later start installs cleanly
+    assert faq_search._backend == "fts5"
+
+
+def test_like_fallback_matches_substrings_in_order(db, monkeypatch):
+    monkeypatch.setattr(faq_search, "_backend", "like")
+    add_faq(db, "Second question", "Mentions SQL joins.", order=2)
+    add_faq(db, "First: what is SQL?", "A query language.", order=1)
+    add_faq(db, "Unrelated", "Nothing here.", order=0)
+    results = faq_search.search(db, "sql")
+    assert questions(results) == ["First: what is SQL?", "Second question"]
+    assert results[0]["question_highlight"] is None and results[0]["snippet"] is None
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
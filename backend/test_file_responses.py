@@ -0,0 +1,80 @@
+"""
+File Response Tests
+Checks the headers serve_file sends for stored uploads, in particular that
+any upload name yields a valid Content-Disposition header.
+Run this with: python -m pytest test_file_responses.py
+"""
+import os
+import sys
+import tempfile
+from urllib.parse import unquote
+
+import pytest
+
+# Settings are read once on first import; keep any later test module in this run off the real database
+_tmp_dir = tempfile.mkdtemp(prefix="file_responses_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'test.db')}"
+os.environ["UPLOAD_DIR"] = os.path.join(_tmp_dir, "uploads")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from starlette.requests import Request
+
+from app.core.file_responses import serve_file
+
+
+def get(headers: dict = None) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+    })
+
+
+def disposition_params(response) -> dict:
+    """Content-Disposition parameters, read back from the encoded header bytes"""
+    header = dict(response.raw_headers)[b"content-disposition"].decode("latin-1")
+    params = {}
+    for part in header.split(";")[1:]:
+        name, _, value = part.strip().partition("=")
+        params[name] = value
+    return params
+
+
+def test_plain_filename_is_quoted_as_is():
+    response = serve_file(get(), "resume.pdf", "abc", content=b"%PDF")
+    assert disposition_params(response) == {"filename": '"resume.pdf"'}
+
+
+@pytest.mark.parametrize("filename, fallback", [
+    ("résumé – 2024.pdf", "resume _ 2024.pdf"),
+    ("履歴書.pdf", "___.pdf"),
+])
+def test_unicode_filename(filename, fallback):
+    response = serve_file(get(), filename, "abc", content=b"%PDF")
+    params = disposition_params(response)
+    assert params["filename"] == f'"{fallback}"'
+    assert params["filename*"].startswith("UTF-8''")
+    assert unquote(params["filename*"][len("UTF-8''"):]) == filename
+
+
+def test_quote_in_filename():
+    filename = 'my "best" resume.pdf'
+    response = serve_file(get(), filename, "abc", content=b"%PDF")
+    params = disposition_params(response)
+    assert params["filename"] == '"my _best_ resume.pdf"'
+    assert unquote(params["filename*"][len("UTF-8''"):]) == filename
+
+
+def test_unicode_filename_from_disk_with_range():
+    path = os.path.join(_tmp_dir, "blob")
+    with open(path, "wb") as f:
+        f.write(b"0123456789")
+    response = serve_file(get({"Range": "bytes=2-5"}), "Lebenslauf_Müller.pdf", None, path=path)
+    assert response.status_code == 206
+    assert unquote(disposition_params(response)["filename*"][len("UTF-8''"):]) == "Lebenslauf_Müller.pdf"
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,86 @@
+"""
+Mock Interview Tests
+Checks interview completion scoring for answers stored as rows and for
+interviews recorded before answers had their own table. Runs in-process
+against a temporary database.
+Run this with: python -m pytest test_interview.py
+"""
+import os
+import sys
+import tempfile
+import uuid
+
+# Point the app at a throwaway database before anything imports the engine
+_tmp_dir = tempfile.mkdtemp(prefix="interview_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'test.db')}"
+os.environ["UPLOAD_DIR"] = os.path.join(_tmp_dir, "uploads")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app, init_database
+from app.core.database import SessionLocal
+from app.models.models import MockInterview, User
+
+init_database()
+client = TestClient(app)
+
+
+def create_user():
+    """Sign up a fresh user and return (user id, auth headers)"""
+    email = f"user_{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/auth/signup", json={"email": email, "name": "Interview Test", "password": "password123"})
+    response = client.post("/auth/login", json={"email": email, "password": "password123"})
+    db = SessionLocal()
+    try:
+        user_id = db.query(User.id).filter(User.email == email).scalar()
+    finally:
+        db.close()
+    return user_id, {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_complete_averages_stored_answers():
+    _, headers = create_user()
+    interview_id = client.post(
+        "/interview/start", json={"role": "SDE", "difficulty": "Easy", "count": 2}, headers=headers
+    ).json()["interview_id"]
+    scores = []
+    for question_id in (1, 2):
+        response = client.post(f"/interview/{interview_id}/respond", json={
+            "question_id": question_id,
+            "question": "Tell me about a project",
+            "response": "I built a web service with Python and PostgreSQL and load tested it.",
+            "expected_points": ["Python"],
+        }, headers=headers)
+        scores.append(response.json()["evaluation"]["score"])
+
+    result = client.post(f"/interview/{interview_id}/complete", headers=headers).json()
+    assert result["overall_score"] == pytest.approx(sum(scores) / len(scores))
+    assert [entry["question_id"] for entry in result["feedback_summary"]] == [1, 2]
+
+
+def test_complete_scores_a_legacy_interview_from_its_json_feedback():
+    user_id, headers = create_user()
+    db = SessionLocal()
+    try:
+        interview = MockInterview(
+            user_id=user_id, role="SDE", difficulty="Medium", question_count=2,
+            questions=[{"id": 1}, {"id": 2}],
+            responses=[{"question_id": 1, "response": "a"}, {"question_id": 2, "response": "b"}],
+            ai_feedback=[{"question_id": 1, "score": 60}, {"question_id": 2, "score": 90}],
+        )
+        db.add(interview)
+        db.commit()
+        interview_id = interview.id
+    finally:
+        db.close()
+
+    result = client.post(f"/interview/{interview_id}/complete", headers=headers).json()
+    assert result["overall_score"] == 75
+    assert result["xp_earned"] == 75 + 10
+    assert [entry["score"] for entry in result["feedback_summary"]] == [60, 90]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,75 @@
+"""
+Lesson Content Tests
+Checks the lesson detail response: the rendered HTML is always returned and
+the raw markdown only on request. Runs in-process against a temporary database.
+Run this with: python -m pytest test_lessons.py
+"""
+import os
+import sys
+import tempfile
+import uuid
+
+# Point the app at a throwaway database before anything imports the engine
+_tmp_dir = tempfile.mkdtemp(prefix="lessons_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'test.db')}"
+os.environ["UPLOAD_DIR"] = os.path.join(_tmp_dir, "uploads")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app, init_database
+from app.core.database import SessionLocal
+from app.models.models import Course, Lesson
+
+init_database()
+client = TestClient(app)
+
+MARKDOWN = "## Arrays\n\nUse **two pointers** for sorted input."
+
+
+def create_user():
+    """Sign up a fresh user and return auth headers"""
+    email = f"user_{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/auth/signup", json={"email": email, "name": "Lesson Test", "password": "password123"})
+    response = client.post("/auth/login", json={"email": email, "password": "password123"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def lesson_url():
+    """An enrolled user's headers and the URL of a lesson with markdown content"""
+    db = SessionLocal()
+    try:
+        course = Course(title=f"Arrays {uuid.uuid4().hex[:8]}", description="Test course", total_lessons=1, xp_reward=100)
+        db.add(course)
+        db.flush()
+        lesson = Lesson(course_id=course.id, title="Two pointers", content=MARKDOWN, order=1)
+        db.add(lesson)
+        db.commit()
+        course_id, lesson_id = course.id, lesson.id
+    finally:
+        db.close()
+    headers = create_user()
+    client.post(f"/courses/{course_id}/enroll", headers=headers)
+    return headers, f"/courses/{course_id}/lessons/{lesson_id}"
+
+
+def test_lesson_returns_html_without_markdown(lesson_url):
+    headers, url = lesson_url
+    lesson = client.get(url, headers=headers).json()
+    assert "<strong>two pointers</strong>" in lesson["content_html"]
+    assert "content" not in lesson
+
+
+def test_markdown_is_opt_in(lesson_url):
+    headers, url = lesson_url
+    client.get(url, headers=headers)  # The cached response without markdown must not be served
+    lesson = client.get(url, params={"include_markdown": True}, headers=headers).json()
+    assert lesson["content"] == MARKDOWN
+    assert "<strong>two pointers</strong>" in lesson["content_html"]
+    assert "content" not in client.get(url, headers=headers).json()
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
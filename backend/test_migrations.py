@@ -0,0 +1,78 @@
+"""
+Schema Upgrade Tests
+Checks that add_missing_columns brings a database created by an older
+version up to date: new columns, their backfills and their indexes.
+Run this with: python -m pytest test_migrations.py
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Settings are read once on first import; keep any later test module in this run off the real database
+_tmp_dir = tempfile.mkdtemp(prefix="migrations_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'test.db')}"
+os.environ["UPLOAD_DIR"] = os.path.join(_tmp_dir, "uploads")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, inspect, text
+
+import app.models.models  # noqa: F401  (registers the tables)
+from app.core.database import add_missing_columns
+
+
+@pytest.fixture
+def old_engine(tmp_path):
+    """A database with the mock_interviews and resumes tables as an older version created them"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE mock_interviews (id INTEGER PRIMARY KEY, user_id INTEGER, role VARCHAR, "
+            "difficulty VARCHAR, questions JSON, responses JSON, ai_feedback JSON, overall_score FLOAT, "
+            "created_at DATETIME)"
+        ))
+        conn.execute(text(
+            "INSERT INTO mock_interviews (id, questions) VALUES (1, '[{\"q\": 1}, {\"q\": 2}]'), (2, 'null'), (3, NULL)"
+        ))
+        conn.execute(text(
+            "CREATE TABLE resumes (id INTEGER PRIMARY KEY, user_id INTEGER, filename VARCHAR, "
+            "file_path VARCHAR, analysis_result JSON, ats_score FLOAT, suggestions JSON, created_at DATETIME)"
+        ))
+    yield engine
+    engine.dispose()
+
+
+def test_new_columns_are_added_and_backfilled(old_engine):
+    add_missing_columns(old_engine)
+    with old_engine.connect() as conn:
+        counts = conn.execute(text("SELECT id, question_count FROM mock_interviews ORDER BY id")).all()
+    assert counts == [(1, 2), (2, 0), (3, 0)]
+    assert "content_hash" in {column["name"] for column in inspect(old_engine).get_columns("resumes")}
+
+
+def test_indexes_of_new_columns_are_created(old_engine):
+    add_missing_columns(old_engine)
+    assert "ix_resumes_content_hash" in {index["name"] for index in inspect(old_engine).get_indexes("resumes")}
+
+
+def test_unique_index_is_skipped_when_old_rows_have_duplicates(old_engine, capsys):
+    with old_engine.begin() as conn:
+        conn.execute(text("CREATE TABLE courses (id INTEGER PRIMARY KEY, title VARCHAR NOT NULL)"))
+        conn.execute(text("INSERT INTO courses (title) VALUES ('Python Basics'), ('Python Basics')"))
+    add_missing_columns(old_engine)
+    assert "ix_courses_title" not in {index["name"] for index in inspect(old_engine).get_indexes("courses")}
+    assert "Could not create index ix_courses_title" in capsys.readouterr().out
+    assert "ix_resumes_content_hash" in {index["name"] for index in inspect(old_engine).get_indexes("resumes")}
+
+
+def test_running_twice_changes_nothing(old_engine):
+    add_missing_columns(old_engine)
+    add_missing_columns(old_engine)
+    with old_engine.connect() as conn:
+        assert conn.execute(text("SELECT sum(question_count) FROM mock_interviews")).scalar() == 2
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
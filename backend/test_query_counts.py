@@ -0,0 +1,95 @@
+"""
+Query Count Regression Tests
+Asserts how many SQL statements each endpoint issues so N+1 query patterns
+don't creep back into the routers. Runs in-process against a temporary database.
+Run this with: python -m pytest test_query_counts.py
+"""
+import os
+import sys
+import tempfile
+import uuid
+from contextlib import contextmanager
+
+# Point the app at a throwaway database before anything imports the engine
+_tmp_dir = tempfile.mkdtemp(prefix="query_counts_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'test.db')}"
+os.environ["UPLOAD_DIR"] = os.path.join(_tmp_dir, "uploads")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.main import app, init_database
+from app.core.database import SessionLocal, engine
+from app.models.models import Course, Lesson
+
+init_database()
+client = TestClient(app)
+
+
+@contextmanager
+def count_queries():
+    """Collect every SQL statement executed on the engine inside the block"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def create_user():
+    """Sign up a fresh user and return auth headers"""
+    email = f"user_{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/auth/signup", json={"email": email, "name": "Query Test", "password": "password123"})
+    response = client.post("/auth/login", json={"email": email, "password": "password123"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def create_courses(count):
+    """Insert courses with one lesson each and return their ids"""
+    db = SessionLocal()
+    try:
+        courses = []
+        for i in range(count):
+            course = Course(title=f"Course {i} {uuid.uuid4().hex[:8]}", description="Test course", total_lessons=1, xp_reward=100)
+            db.add(course)
+            db.flush()
+            db.add(Lesson(course_id=course.id, title=f"Lesson {i}", content="Content", order=1))
+            courses.append(course)
+        db.commit()
+        return [course.id for course in courses]
+    finally:
+        db.close()
+
+
+def my_courses_query_count(enrollments):
+    headers = create_user()
+    for course_id in create_courses(enrollments):
+        client.post(f"/courses/{course_id}/enroll", headers=headers)
+
+    with count_queries() as statements:
+        response = client.get("/courses/my-courses", headers=headers)
+
+    assert response.status_code == 200
+    assert len(response.json()["courses"]) == enrollments
+    return len(statements)
+
+
+def test_my_courses_query_count_is_constant():
+    """Enrolling in more courses must not add queries (no per-row lookups)"""
+    assert my_courses_query_count(1) == my_courses_query_count(5)
+
+
+def test_my_courses_query_budget():
+    """One query to authenticate the user plus one joined query for the courses"""
+    assert my_courses_query_count(3) <= 2
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,101 @@
+"""
+Resume Analysis Cache Tests
+Checks that only analyses from the LLM are cached: the local fallback,
+used when the AI is unavailable or its call fails, must not be pinned.
+Runs against a temporary database with the parser and the LLM stubbed.
+Run this with: python -m pytest test_resume_cache.py
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import uuid
+
+import pytest
+
+# Point the app at a throwaway database before anything imports the engine
+_tmp_dir = tempfile.mkdtemp(prefix="resume_cache_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'test.db')}"
+os.environ["UPLOAD_DIR"] = os.path.join(_tmp_dir, "uploads")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.main import init_database
+from app.core.database import SessionLocal
+from app.models.models import ResumeAnalysis
+from app.services import resume_jobs
+from app.services.ai_service import ai_service
+
+init_database()
+
+RESUME_TEXT = """Jane Doe
+jane@example.com | +1 555 0100
+Experience
+Software Engineer at Acme, 2019 - 2024: built Python services handling 2M requests a day
+Education
+BSc Computer Science
+Skills
+Python, SQL, Docker, AWS
+"""
+
+
+class FailingModel:
+    def generate_content(self, prompt):
+        raise RuntimeError("quota exceeded")
+
+
+class Reply:
+    text = json.dumps({"ats_score": 88, "strengths": ["From the LLM"]})
+
+
+class WorkingModel:
+    def generate_content(self, prompt):
+        return Reply()
+
+
+@pytest.fixture
+def analyze(monkeypatch):
+    """Run analyze_upload on fresh content with the given model; returns the analysis and the cache entry"""
+    async def parse(filename, content):
+        return RESUME_TEXT + uuid.uuid4().hex  # Distinct text, so the text-hash cache can't hit either
+
+    monkeypatch.setattr(resume_jobs, "parse_resume_async", parse)
+    monkeypatch.setattr(ai_service, "use_ai", True)
+
+    def run(model):
+        monkeypatch.setattr(ai_service, "_model", model)
+        content_hash = uuid.uuid4().hex
+        db = SessionLocal()
+        try:
+            analysis = asyncio.run(resume_jobs.analyze_upload(db, "resume.pdf", content_hash, b"%PDF"))
+            db.commit()
+            entry = db.query(ResumeAnalysis).filter(ResumeAnalysis.content_hash == content_hash).first()
+            return analysis, entry
+        finally:
+            db.close()
+
+    return run
+
+
+def test_llm_failure_is_not_cached(analyze):
+    analysis, entry = analyze(FailingModel())
+    assert 0 <= analysis["ats_score"] <= 100  # The local analysis is still returned
+    assert entry is None
+
+
+def test_ai_unavailable_is_not_cached(analyze, monkeypatch):
+    monkeypatch.setattr(ai_service, "use_ai", False)
+    analysis, entry = analyze(None)
+    assert analysis["ats_score"] is not None
+    assert entry is None
+
+
+def test_llm_analysis_is_cached(analyze):
+    analysis, entry = analyze(WorkingModel())
+    assert analysis["ats_score"] == 88
+    assert entry is not None and entry.analysis["strengths"] == ["From the LLM"]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,87 @@
+"""
+Resume Parser Pool Tests
+Checks that a parse which exceeds PARSER_TIMEOUT kills only its own worker
+process, so parses running alongside it still succeed.
+Run this with: python -m pytest test_resume_parser.py
+"""
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import pytest
+
+# Settings are read once on first import; keep any later test module in this run off the real database
+_tmp_dir = tempfile.mkdtemp(prefix="resume_parser_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'test.db')}"
+os.environ["UPLOAD_DIR"] = os.path.join(_tmp_dir, "uploads")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.config import settings
+from app.services import resume_parser
+
+# The stand-in parser below reaches the workers by being inherited through fork
+pytestmark = pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork", reason="needs fork-started pool workers"
+)
+
+
+# Each parse appends its filename here, so a parse that had to be retried shows up twice
+RUNS_FILE = os.path.join(_tmp_dir, "runs.txt")
+
+
+def fake_parse(filename, file_content):
+    """Hangs on slow.pdf; anything else parses after a second"""
+    with open(RUNS_FILE, "a") as f:
+        f.write(filename + "\n")
+    if filename == "slow.pdf":
+        time.sleep(60)
+    time.sleep(1.0)
+    return f"text of {filename}"
+
+
+def runs(filename):
+    with open(RUNS_FILE) as f:
+        return f.read().split().count(filename)
+
+
+@pytest.fixture
+def parser_pool(monkeypatch):
+    monkeypatch.setattr(settings, "PARSER_WORKERS", 2)
+    monkeypatch.setattr(settings, "PARSER_TIMEOUT", 2.0)
+    monkeypatch.setattr(resume_parser, "parse_resume", fake_parse)
+    resume_parser.shutdown_pool()
+    open(RUNS_FILE, "w").close()
+    yield
+    resume_parser.shutdown_pool()
+
+
+def test_timeout_only_kills_its_own_worker(parser_pool):
+    async def run():
+        slow = asyncio.create_task(resume_parser.parse_resume_async("slow.pdf", b""))
+        await asyncio.sleep(1.5)  # Still running when the slow parse times out at 2s
+        fast = asyncio.create_task(resume_parser.parse_resume_async("fast.pdf", b""))
+        return await asyncio.gather(slow, fast, return_exceptions=True)
+
+    slow_result, fast_result = asyncio.run(run())
+    assert isinstance(slow_result, TimeoutError)
+    assert fast_result == "text of fast.pdf"
+    assert runs("fast.pdf") == 1  # Not killed along with the slow one and retried
+
+
+def test_pool_keeps_working_after_a_timeout(parser_pool):
+    async def run():
+        with pytest.raises(TimeoutError):
+            await resume_parser.parse_resume_async("slow.pdf", b"")
+        return await asyncio.gather(*(
+            resume_parser.parse_resume_async(f"resume{i}.pdf", b"") for i in range(2)
+        ))
+
+    assert asyncio.run(run()) == [f"text of resume{i}.pdf" for i in range(2)]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,108 @@
+"""
+Search Index Tests
+Checks typo tolerance and search-as-you-type matching of the in-memory
+search index, using a small hand-built index (no database), and the
+validation of the /search endpoint's type filter.
+Run this with: python -m pytest test_search_index.py
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Settings are read once on first import; keep any later test module in this run off the real database
+_tmp_dir = tempfile.mkdtemp(prefix="search_index_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'test.db')}"
+os.environ["UPLOAD_DIR"] = os.path.join(_tmp_dir, "uploads")
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+from app.main import app, init_database
+from app.services.search_index import SearchIndex, edit_distance
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex()
+    documents = [
+        ("course", 1, "Python Programming for Interviews", "Learn Python from basics to advanced"),
+        ("course", 2, "System Design", "Design scalable distributed systems"),
+        ("faq", 3, "How do I prepare for an interview?", "Practice mock interviews every week"),
+        ("lesson", 4, "Databases", "Indexes, transactions and SQL queries"),
+    ]
+    for doc_type, doc_id, title, body in documents:
+        index.upsert(f"{doc_type}:{doc_id}", {"type": doc_type, "id": doc_id, "title": title, "body": body})
+    return index
+
+
+def ids(results):
+    return [hit["id"] for hit in results]
+
+
+@pytest.mark.parametrize("a, b, distance", [
+    ("python", "python", 0),
+    ("pythn", "python", 1),  # Deletion
+    ("pyython", "python", 1),  # Insertion
+    ("pythan", "python", 1),  # Substitution
+    ("pyhton", "python", 1),  # Transposition
+    ("interveiw", "interview", 1),
+    ("kitten", "sitting", 3),
+])
+def test_edit_distance(a, b, distance):
+    assert edit_distance(a, b, limit=2) == min(distance, 3)
+
+
+@pytest.mark.parametrize("query", ["pythn", "pyhton", "pythan"])
+def test_one_letter_typos_in_a_short_term(index, query):
+    assert ids(index.search(query))[:1] == [1]
+
+
+@pytest.mark.parametrize("query", ["interveiw", "intervew", "sytsem desgn"])
+def test_typos_in_longer_terms(index, query):
+    assert ids(index.search(query))
+
+
+def test_short_terms_allow_only_one_typo(index):
+    assert index.search("pyhtn") == []
+
+
+def test_unrelated_term_finds_nothing(index):
+    assert index.search("xqzv") == []
+
+
+@pytest.mark.parametrize("query", ["pyt", "programmi", "databa", "system desi"])
+def test_last_term_matches_as_prefix(index, query):
+    assert ids(index.search(query))
+
+
+def test_half_typed_suffix_matches_the_stem(index):
+    # "programming" is indexed as "program", which "programmi" is not a prefix of
+    assert ids(index.search("programmi")) == [1]
+
+
+def test_type_filter(index):
+    assert ids(index.search("interview", types=["faq"])) == [3]
+
+
+@pytest.fixture(scope="module")
+def client():
+    init_database()
+    return TestClient(app)
+
+
+def test_endpoint_accepts_known_types(client):
+    response = client.get("/search", params={"q": "python", "type": ["course", "faq"]})
+    assert response.status_code == 200
+    assert {hit["type"] for hit in response.json()["results"]} <= {"course", "faq"}
+
+
+@pytest.mark.parametrize("types", [["foo"], ["course", "foo"], ["Course"]])
+def test_endpoint_rejects_unknown_types(client, types):
+    # Dropping them instead would turn an all-invalid filter into no filter at all
+    assert client.get("/search", params={"q": "python", "type": types}).status_code == 422
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -323,9 +323,14 @@ export default function CourseViewer() {
                             )}
                         </div>
 
-                        <div className="lesson-body">
-                            {lessonContent.content || "No text content available for this lesson."}
-                        </div>
+                        {lessonContent.content_html ? (
+                            // Rendered and sanitized on the server
+                            <div className="lesson-body lesson-body-html" dangerouslySetInnerHTML={{ __html: lessonContent.content_html }} />
+                        ) : (
+                            <div className="lesson-body">
+                                No text content available for this lesson.
+                            </div>
+                        )}
 
                         {/* Related Videos Section */}
                         <div className="related-videos-section">
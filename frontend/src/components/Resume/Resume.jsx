@@ -16,6 +16,10 @@ import {
 } from 'lucide-react';
 import './Resume.css';
 
+const JOB_POLL_INTERVAL_MS = 1000;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
 export default function Resume() {
     const [file, setFile] = useState(null);
     const [uploading, setUploading] = useState(false);
@@ -35,7 +39,16 @@ export default function Resume() {
         setUploading(true);
         try {
             const res = await resumeAPI.upload(file);
-            setAnalysis(res.data.analysis);
+            // Analysis runs in the background; poll the job until it finishes
+            let job = res.data;
+            while (job.status === 'queued' || job.status === 'processing') {
+                await sleep(JOB_POLL_INTERVAL_MS);
+                job = (await resumeAPI.getJob(res.data.job_id)).data;
+            }
+            if (job.status === 'failed') {
+                throw new Error(job.error || 'Resume analysis failed');
+            }
+            setAnalysis(job.analysis);
         } catch (error) {
             alert('Upload failed: ' + (error.response?.data?.detail || error.message));
         } finally {
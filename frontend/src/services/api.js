@@ -66,6 +66,7 @@ export const resumeAPI = {
             },
         });
     },
+    getJob: (jobId) => api.get(`/resume/jobs/${jobId}`),
     getAnalysis: (resumeId) => api.get(`/resume/${resumeId}`),
     getAll: () => api.get('/resume/all'),
 };